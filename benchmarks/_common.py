@@ -0,0 +1,137 @@
+# ruff: noqa: T201
+import itertools
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from typing import TYPE_CHECKING, Any
+
+import nonebot
+
+if TYPE_CHECKING:
+    from nonebot.adapters.onebot.v11 import (
+        Bot,
+        GroupMessageEvent,
+        PrivateMessageEvent,
+    )
+
+    from nonebot_plugin_werewolf.game import Game
+    from nonebot_plugin_werewolf.models import Role
+
+fake_id = (lambda: (g := itertools.count(300000)) and (lambda: next(g)))()
+
+
+def setup() -> None:
+    """初始化 NoneBot 并加载插件, 需在导入插件模块前调用"""
+    from nonebot.adapters.onebot.v11 import Adapter
+
+    nonebot.init(driver="~none", log_level="WARNING")
+    nonebot.get_driver().register_adapter(Adapter)
+    nonebot.require("nonebot_plugin_werewolf")
+
+
+def fake_bot(self_id: str = "1") -> "Bot":
+    from nonebot.adapters.onebot.v11 import Adapter, Bot
+
+    return Bot(nonebot.get_adapter(Adapter), self_id)
+
+
+def fake_group_event(user_id: int, group_id: int) -> "GroupMessageEvent":
+    from nonebot.adapters.onebot.v11 import GroupMessageEvent, Message
+    from nonebot.adapters.onebot.v11.event import Sender
+
+    return GroupMessageEvent(
+        time=1000000,
+        self_id=1,
+        post_type="message",
+        sub_type="normal",
+        user_id=user_id,
+        message_type="group",
+        group_id=group_id,
+        message_id=fake_id(),
+        message=Message("test"),
+        original_message=Message("test"),
+        raw_message="test",
+        font=0,
+        sender=Sender(card="", nickname="test", role="member"),
+        to_me=False,
+    )
+
+
+def fake_private_event(user_id: int) -> "PrivateMessageEvent":
+    from nonebot.adapters.onebot.v11 import Message, PrivateMessageEvent
+    from nonebot.adapters.onebot.v11.event import Sender
+
+    return PrivateMessageEvent(
+        time=1000000,
+        self_id=1,
+        post_type="message",
+        sub_type="friend",
+        user_id=user_id,
+        message_type="private",
+        message_id=fake_id(),
+        message=Message("test"),
+        original_message=Message("test"),
+        raw_message="test",
+        font=0,
+        sender=Sender(nickname="test"),
+        to_me=False,
+    )
+
+
+def fake_game(
+    bot: "Bot",
+    player_num: int = 12,
+    roles: "Sequence[Role] | None" = None,
+) -> "Game":
+    """在 `bot` 下构造一局未启动的游戏, 群号与玩家编号全局唯一
+
+    未指定 `roles` 时所有玩家均为平民
+    """
+    from nonebot_plugin_werewolf.models import Role
+    from tests.fake import fake_game as build_game
+
+    roles = roles or [Role.CIVILIAN] * player_num
+    return build_game(
+        *roles,
+        user_ids=[str(fake_id()) for _ in roles],
+        group_id=str(fake_id()),
+        self_id=bot.self_id,
+        adapter=bot.adapter.get_name(),
+    )
+
+
+async def timeit_async(
+    func: Callable[[], Awaitable[Any]],
+    number: int = 10000,
+) -> float:
+    """返回单次调用的平均耗时 (微秒)"""
+    for _ in range(number // 10):
+        await func()
+
+    start = time.perf_counter()
+    for _ in range(number):
+        await func()
+    return (time.perf_counter() - start) / number * 1e6
+
+
+def timeit_sync(func: Callable[[], Any], number: int = 100000) -> float:
+    """返回单次调用的平均耗时 (微秒)"""
+    for _ in range(number // 10):
+        func()
+
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - start) / number * 1e6
+
+
+def report(title: str, rows: list[tuple[str, ...]], header: tuple[str, ...]) -> None:
+    widths = [
+        max(len(str(row[i])) for row in [header, *rows]) for i in range(len(header))
+    ]
+    print(f"\n{title}")
+    for row in [header, *rows]:
+        print(
+            "  ".join(
+                str(cell).rjust(width) for cell, width in zip(row, widths, strict=True)
+            )
+        )
@@ -0,0 +1,93 @@
+"""测量 `InputStore` 的 put/fetch 吞吐量
+
+运行: `python -m benchmarks.bench_input_store`
+"""
+
+import timeit
+
+import anyio
+import anyio.lowlevel
+
+from ._common import report, setup
+
+NUMBER = 50000
+
+
+async def bench_buffered() -> float:
+    from nonebot_plugin_alconna import UniMessage
+
+    from nonebot_plugin_werewolf.utils import InputStore
+
+    store = InputStore()
+    msg = UniMessage.text("1")
+
+    start = anyio.current_time()
+    for _ in range(NUMBER):
+        store.put(msg, "10001", "20001")
+        await store.fetch("10001", "20001")
+    return NUMBER / (anyio.current_time() - start)
+
+
+async def bench_parked() -> float:
+    from nonebot_plugin_alconna import UniMessage
+
+    from nonebot_plugin_werewolf.utils import InputStore
+
+    store = InputStore()
+    msg = UniMessage.text("1")
+    received = 0
+
+    async def consumer() -> None:
+        nonlocal received
+        while True:
+            await store.fetch("10001")
+            received += 1
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(consumer)
+        await anyio.lowlevel.checkpoint()
+
+        start = anyio.current_time()
+        for _ in range(NUMBER):
+            store.put(msg, "10001")
+            # 等待 consumer 取出消息并重新进入等待
+            while ("10001", None) not in store.tasks:
+                await anyio.lowlevel.checkpoint()
+        elapsed = anyio.current_time() - start
+        tg.cancel_scope.cancel()
+
+    assert received == NUMBER  # noqa: S101
+    return NUMBER / elapsed
+
+
+def bench_key() -> list[tuple[str, ...]]:
+    user_id, group_id = "1234567890", "9876543210"
+    str_keys = {f"{group_id}_{user_id}": None}
+    tuple_keys = {(user_id, group_id): None}
+    number = 1000000
+
+    cost_str = timeit.timeit(lambda: f"{group_id}_{user_id}" in str_keys, number=number)
+    cost_tuple = timeit.timeit(lambda: (user_id, group_id) in tuple_keys, number=number)
+    return [
+        ("f-string 键", f"{cost_str / number * 1e9:.1f}"),
+        ("tuple 键", f"{cost_tuple / number * 1e9:.1f}"),
+    ]
+
+
+async def main() -> None:
+    buffered = await bench_buffered()
+    parked = await bench_parked()
+    report(
+        "InputStore put/fetch",
+        [
+            ("先 put 后 fetch (缓存)", f"{buffered:,.0f}"),
+            ("fetch 等待中 put", f"{parked:,.0f}"),
+        ],
+        ("场景", "吞吐量(次/秒)"),
+    )
+    report("构造键并查找", bench_key(), ("键类型", "耗时(ns/次)"))
+
+
+if __name__ == "__main__":
+    setup()
+    anyio.run(main)
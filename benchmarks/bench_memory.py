@@ -0,0 +1,74 @@
+"""测量每局游戏对象的内存占用
+
+运行: `python -m benchmarks.bench_memory`
+"""
+
+import gc
+import tracemalloc
+
+import anyio
+
+from ._common import fake_bot, fake_game, report, setup
+
+GAME_COUNT = 200
+PLAYER_NUM = 12
+
+
+def create_games(*, touch: bool) -> list[object]:
+    from nonebot_plugin_werewolf.game import GameMessenger
+    from nonebot_plugin_werewolf.models import Role
+    from nonebot_plugin_werewolf.utils import logger_wrapper
+
+    roles = [
+        *[Role.WEREWOLF] * 3,
+        Role.WOLFKING,
+        Role.PROPHET,
+        Role.WITCH,
+        Role.HUNTER,
+        Role.GUARD,
+        *[Role.CIVILIAN] * (PLAYER_NUM - 8),
+    ]
+    bot = fake_bot()
+    games: list[object] = []
+    for _ in range(GAME_COUNT):
+        game = fake_game(bot, roles=roles)
+        game.log = logger_wrapper(game.group.id)
+        game.messenger = GameMessenger(
+            game.group, game.players.members, game.transport, game.log
+        )
+        if touch:
+            # 模拟所有玩家都已收发过消息并进入死者频道等待
+            for player in game.players:
+                _ = player.killed, player._send_handler  # noqa: SLF001
+        games.append(game)
+    return games
+
+
+def measure(*, touch: bool) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    games = create_games(touch=touch)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del games
+    return size / GAME_COUNT
+
+
+async def main() -> None:
+    rows = [
+        ("惰性创建 (空闲)", f"{measure(touch=False):.0f}"),
+        ("事件/发送器已创建", f"{measure(touch=True):.0f}"),
+    ]
+    report(
+        f"每局游戏内存占用 ({GAME_COUNT} 局, {PLAYER_NUM} 名玩家)",
+        rows,
+        ("状态", "字节/局"),
+    )
+
+
+if __name__ == "__main__":
+    setup()
+    anyio.run(main)
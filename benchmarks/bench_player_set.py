@@ -0,0 +1,68 @@
+"""对比 `PlayerSet` 与 `Roster` 的常见查询开销
+
+运行: `python -m benchmarks.bench_player_set`
+"""
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from ._common import fake_bot, fake_game, report, setup, timeit_sync
+
+if TYPE_CHECKING:
+    from nonebot_plugin_werewolf.player_set import PlayerSet, Roster
+
+
+def queries(players: "PlayerSet | Roster") -> list[tuple[str, Callable[[], Any]]]:
+    from nonebot_plugin_werewolf.models import Role, RoleGroup
+    from nonebot_plugin_werewolf.utils import add_players_button
+
+    player = next(iter(players))
+    return [
+        ("alive()", players.alive),
+        ("dead()", players.dead),
+        ("killed().exclude(p)", lambda: players.killed().exclude(player)),
+        ("select(WEREWOLF)", lambda: players.select(RoleGroup.WEREWOLF)),
+        ("exclude(CIVILIAN, OTHERS)", lambda: players.exclude(Role.CIVILIAN, RoleGroup.OTHERS)),  # noqa: E501
+        ("alive().select(WEREWOLF)", lambda: players.alive().select(RoleGroup.WEREWOLF)),  # noqa: E501
+        ("alive() 选择菜单", lambda: add_players_button(players.alive().show(), players.alive())),  # noqa: E501
+    ]  # fmt: skip
+
+
+def main() -> None:
+    from nonebot_plugin_werewolf.models import Role
+    from nonebot_plugin_werewolf.player_set import PlayerSet
+
+    roles = [
+        *[Role.WEREWOLF] * 3,
+        Role.WOLFKING,
+        Role.PROPHET,
+        Role.WITCH,
+        Role.HUNTER,
+        Role.GUARD,
+        *[Role.CIVILIAN] * 4,
+    ]
+    roster = fake_game(fake_bot(), roles=roles).players
+    # 模拟对局中途: 部分玩家已死亡
+    for player in roster.sorted[:4]:
+        player.alive = False
+        player.killed.set()
+        roster.refresh(player)
+    plain = PlayerSet(roster)
+
+    rows: list[tuple[str, ...]] = []
+    for (name, query), (_, indexed) in zip(
+        queries(plain), queries(roster), strict=True
+    ):
+        before, after = timeit_sync(query), timeit_sync(indexed)
+        rows.append((name, f"{before:.2f}", f"{after:.2f}"))
+
+    report(
+        "PlayerSet 查询 (12 名玩家, 4 名死亡)",
+        rows,
+        ("查询", "PlayerSet(μs)", "Roster(μs)"),
+    )
+
+
+if __name__ == "__main__":
+    setup()
+    main()
@@ -0,0 +1,54 @@
+"""测量 `rule_in_game` 在不同运行中游戏数量下的单条消息开销
+
+运行: `python -m benchmarks.bench_rule_in_game`
+"""
+
+import anyio
+
+from ._common import (
+    fake_bot,
+    fake_game,
+    fake_group_event,
+    fake_private_event,
+    report,
+    setup,
+    timeit_async,
+)
+
+GAME_COUNTS = (0, 10, 200)
+
+
+async def main() -> None:
+    from nonebot_plugin_werewolf.game import game_registry
+    from nonebot_plugin_werewolf.matchers.depends import rule_in_game
+
+    bot = fake_bot()
+    rows: list[tuple[str, ...]] = []
+
+    for count in GAME_COUNTS:
+        games = [fake_game(bot) for _ in range(count)]
+        for game in games:
+            game_registry._add(game)  # noqa: SLF001
+
+        stranger_group = fake_group_event(user_id=1, group_id=2)
+        stranger_private = fake_private_event(user_id=1)
+        cases = [("非玩家群聊", stranger_group), ("非玩家私聊", stranger_private)]
+        if games:
+            player = next(iter(games[-1].players))
+            user_id, group_id = int(player.user_id), int(games[-1].group.id)
+            cases.append(("玩家群聊", fake_group_event(user_id, group_id)))
+            cases.append(("玩家私聊", fake_private_event(user_id)))
+
+        for name, event in cases:
+            cost = await timeit_async(lambda e=event: rule_in_game(bot, e))
+            rows.append((str(count), name, f"{cost:.2f}"))
+
+        for game in games:
+            game_registry._remove(game)  # noqa: SLF001
+
+    report("rule_in_game", rows, ("运行中游戏", "消息类型", "耗时(μs/条)"))
+
+
+if __name__ == "__main__":
+    setup()
+    anyio.run(main)
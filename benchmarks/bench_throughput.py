@@ -0,0 +1,109 @@
+"""测量多局游戏并发进行时的吞吐量、回复延迟与内存峰值
+
+由自动化玩家 (heuristic) 驱动 `Game.run` 完成整局游戏, 使用虚拟时钟跳过所有等待,
+结果反映引擎自身的处理开销
+
+回复延迟为自动化玩家发送回复到同一局游戏发出下一条提示的实际耗时,
+所有对局共用同一事件循环, 并发局数越多, 其中包含的调度等待越多
+
+运行: `python -m benchmarks.bench_throughput [并发局数 ...] [--no-trace]`,
+默认测量 1/10/100 局, 更高的并发局数 (如 500) 需在命令行中指定
+"""
+
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+import anyio
+
+from ._common import report, setup
+
+LEVELS = (1, 10, 100)
+PLAYER_NUM = 9
+SEED = 7685
+
+
+async def measure(games: int, *, trace: bool) -> tuple[str, ...]:
+    from nonebot_plugin_werewolf.clock import VirtualClock
+    from nonebot_plugin_werewolf.simulation import HeuristicAgent, simulate_game
+
+    rng = random.Random(SEED)  # noqa: S311
+    clock = VirtualClock()
+    latencies: list[float] = []
+    finished = 0
+
+    async def run(index: int) -> None:
+        nonlocal finished
+        # 本局上次提示后最早一条回复的发送时间
+        replied: float | None = None
+
+        def on_reply(_: str) -> None:
+            nonlocal replied
+            if replied is None:
+                replied = time.perf_counter()
+
+        def on_prompt(_: object) -> None:
+            nonlocal replied
+            if replied is not None:
+                latencies.append(time.perf_counter() - replied)
+                replied = None
+
+        game = await simulate_game(
+            lambda p: HeuristicAgent(p, rng),
+            PLAYER_NUM,
+            group_id=f"bench-{games}-{index}",
+            clock=clock,
+            on_prompt=on_prompt,
+            on_reply=on_reply,
+        )
+        finished += game.status is not None
+
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(clock.run)
+        async with anyio.create_task_group() as runs:
+            for index in range(games):
+                runs.start_soon(run, index)
+        tg.cancel_scope.cancel()
+    elapsed = time.perf_counter() - start
+    peak = "-"
+    if trace:
+        peak = f"{tracemalloc.get_traced_memory()[1] / 2**20:.1f}"
+        tracemalloc.stop()
+
+    # 少于两个样本时无法计算分位数
+    p50 = p99 = "-"
+    if len(latencies) >= 2:
+        percentiles = statistics.quantiles(latencies, n=100)
+        p50, p99 = f"{percentiles[49] * 1e3:.2f}", f"{percentiles[98] * 1e3:.2f}"
+    return (
+        str(games),
+        str(finished),
+        f"{games / elapsed:.1f}",
+        p50,
+        p99,
+        peak,
+    )
+
+
+async def main() -> None:
+    args = sys.argv[1:]
+    trace = "--no-trace" not in args
+    levels = [int(arg) for arg in args if arg.isdigit()] or LEVELS
+
+    rows = [await measure(games, trace=trace) for games in levels]
+    report(
+        f"并发对局吞吐量 ({PLAYER_NUM} 名玩家)"
+        + (", 启用 tracemalloc" if trace else ""),
+        rows,
+        ("并发局数", "完成局数", "局/秒", "p50 回复→提示(ms)", "p99 回复→提示(ms)", "内存峰值(MB)"),  # noqa: E501
+    )  # fmt: skip
+
+
+if __name__ == "__main__":
+    setup()
+    anyio.run(main)
@@ -0,0 +1,104 @@
+"""由自动化玩家并发进行多局游戏, 用于负载测试
+
+运行: `python -m benchmarks.simulate --games 100 --players 9 --agent heuristic`
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+
+import anyio
+
+from ._common import report, setup
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=100, help="并发进行的游戏局数")
+    parser.add_argument("--players", type=int, default=9, help="每局玩家数")
+    parser.add_argument(
+        "--agent",
+        default="heuristic",
+        help="自动化玩家类型 (abstain/random/spammy/heuristic), 或以逗号分隔混合使用",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="随机数种子")
+    parser.add_argument("--max-days", type=int, default=20, help="每局最多进行的天数")
+    parser.add_argument(
+        "--real-time",
+        action="store_true",
+        help="使用真实时间计时, 默认使用虚拟时钟跳过所有等待",
+    )
+    return parser.parse_args()
+
+
+async def main(args: argparse.Namespace) -> None:
+    from nonebot_plugin_werewolf.clock import Clock, VirtualClock, real_clock
+    from nonebot_plugin_werewolf.metrics import metrics
+    from nonebot_plugin_werewolf.player import Player
+    from nonebot_plugin_werewolf.simulation import Agent, agents, simulate_game
+
+    rng = random.Random(args.seed)  # noqa: S311
+    kinds = [agents[name.strip()] for name in args.agent.split(",")]
+
+    def agent(player: Player) -> Agent:
+        return rng.choice(kinds)(player, rng)
+
+    virtual = None if args.real_time else VirtualClock()
+    clock: Clock = virtual or real_clock
+    results: Counter[str] = Counter()
+    days: list[int] = []
+
+    async def run(index: int) -> None:
+        game = await simulate_game(
+            agent,
+            args.players,
+            group_id=f"sim-{index}",
+            clock=clock,
+            max_days=args.max_days,
+        )
+        results[game.status.name if game.status else "ABORTED"] += 1
+        days.append(game.context.day)
+
+    start = time.perf_counter()
+    async with anyio.create_task_group() as tg:
+        if virtual is not None:
+            tg.start_soon(virtual.run)
+        async with anyio.create_task_group() as games:
+            for index in range(args.games):
+                games.start_soon(run, index)
+        tg.cancel_scope.cancel()
+    elapsed = time.perf_counter() - start
+
+    rows = [(status, str(count)) for status, count in results.most_common()]
+    rows += [
+        ("平均天数", f"{sum(days) / len(days):.2f}"),
+        ("耗时(s)", f"{elapsed:.2f}"),
+        ("局/秒", f"{args.games / elapsed:.1f}"),
+    ]
+    report(
+        f"模拟对局 ({args.games} 局, {args.players} 名玩家, {args.agent})",
+        rows,
+        ("指标", "值"),
+    )
+
+    phases = metrics.snapshot()
+    report(
+        "各阶段耗时与 API 调用次数",
+        [
+            (
+                phase,
+                str(hist["count"]),
+                f"{hist['mean'] * 1e3:.2f}",
+                f"{phases['phase.api_calls'][phase]['mean']:.1f}",
+            )
+            for phase, hist in phases.get("phase.duration", {}).items()
+        ],
+        ("阶段", "次数", "平均耗时(ms)", "平均调用次数"),
+    )
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    setup()
+    anyio.run(main, arguments)
@@ -0,0 +1,138 @@
+import abc
+import contextlib
+import heapq
+import itertools
+from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager
+from typing import NoReturn
+from typing_extensions import override
+
+import anyio
+import anyio.lowlevel
+
+
+class Clock(abc.ABC):
+    """游戏计时使用的时钟, 所有阶段限时与等待均通过时钟进行"""
+
+    @abc.abstractmethod
+    def now(self) -> float:
+        """当前时间 (秒)"""
+
+    @abc.abstractmethod
+    async def sleep(self, delay: float) -> None:
+        """等待 `delay` 秒"""
+
+    @abc.abstractmethod
+    def move_on_after(
+        self, delay: float | None
+    ) -> AbstractContextManager[anyio.CancelScope]:
+        """`delay` 秒后取消代码块, 用法同 `anyio.move_on_after`"""
+
+
+class RealClock(Clock):
+    """使用事件循环时间的时钟"""
+
+    @override
+    def now(self) -> float:
+        return anyio.current_time()
+
+    @override
+    async def sleep(self, delay: float) -> None:
+        await anyio.sleep(delay)
+
+    @override
+    def move_on_after(self, delay: float | None) -> anyio.CancelScope:
+        return anyio.move_on_after(delay)
+
+
+real_clock = RealClock()
+
+
+class _Timer:
+    __slots__ = ("callback",)
+
+    callback: Callable[[], object] | None
+
+    def __init__(self, callback: Callable[[], object]) -> None:
+        self.callback = callback
+
+    def cancel(self) -> None:
+        self.callback = None
+
+    def fire(self) -> None:
+        callback, self.callback = self.callback, None
+        if callback is not None:
+            callback()
+
+
+class VirtualClock(Clock):
+    """虚拟时钟, 时间仅在调用 `advance` 或运行 `run` 时推进
+
+    `run` 在其他任务全部阻塞时直接跳转到最近的计时点,
+    使长时间的阶段限时在测试与模拟中瞬间完成
+    """
+
+    def __init__(self, start: float = 0.0) -> None:
+        self._now = start
+        self._timers: list[tuple[float, int, _Timer]] = []
+        self._seq = itertools.count()
+        self._wakeup = anyio.Event()
+
+    def _schedule(self, delay: float, callback: Callable[[], object]) -> _Timer:
+        timer = _Timer(callback)
+        heapq.heappush(self._timers, (self._now + delay, next(self._seq), timer))
+        self._wakeup.set()
+        return timer
+
+    def _next_deadline(self) -> float | None:
+        # 丢弃已取消的计时器
+        while self._timers and self._timers[0][2].callback is None:
+            heapq.heappop(self._timers)
+        return self._timers[0][0] if self._timers else None
+
+    @override
+    def now(self) -> float:
+        return self._now
+
+    @override
+    async def sleep(self, delay: float) -> None:
+        if delay <= 0:
+            await anyio.lowlevel.checkpoint()
+            return
+
+        event = anyio.Event()
+        timer = self._schedule(delay, event.set)
+        try:
+            await event.wait()
+        finally:
+            timer.cancel()
+
+    @override
+    @contextlib.contextmanager
+    def move_on_after(self, delay: float | None) -> Generator[anyio.CancelScope]:
+        with anyio.CancelScope() as scope:
+            timer = None if delay is None else self._schedule(delay, scope.cancel)
+            try:
+                yield scope
+            finally:
+                if timer is not None:
+                    timer.cancel()
+
+    def advance(self, seconds: float) -> None:
+        """推进虚拟时间, 依次触发到期的计时器"""
+        target = self._now + seconds
+        while (deadline := self._next_deadline()) is not None and deadline <= target:
+            _, _, timer = heapq.heappop(self._timers)
+            self._now = max(self._now, deadline)
+            timer.fire()
+        self._now = max(self._now, target)
+
+    async def run(self) -> NoReturn:
+        """自动推进时间: 其他任务全部阻塞时跳转到最近的计时点"""
+        while True:
+            await anyio.wait_all_tasks_blocked()
+            if (deadline := self._next_deadline()) is not None:
+                self.advance(deadline - self._now)
+            else:
+                self._wakeup = anyio.Event()
+                await self._wakeup.wait()
@@ -76,6 +76,7 @@ class GameBehavior(ConfigFile):
     show_roles_list_on_start: bool = False
     speak_in_turn: bool = False
     dead_channel_rate_limit: int = 8  # per minute
+    dead_channel_burst: int = Field(default=8, ge=1)
     werewolf_multi_select: bool = False
     timeout: Final[_Timeout] = _Timeout()
 
@@ -105,9 +106,27 @@ class MatcherPriorityConfig(BaseModel):
         return model
 
 
+class TokenBucketConfig(BaseModel):
+    rate: float = Field(default=0.0, ge=0.0)  # 每秒可发送消息数, 为 0 时不限制
+    burst: int = Field(default=5, ge=1)
+
+
+class RateLimitConfig(BaseModel):
+    group: TokenBucketConfig = TokenBucketConfig()
+    private: TokenBucketConfig = TokenBucketConfig()
+
+
 class PluginConfig(BaseModel):
     enable_poke: bool = True
     enable_button: bool = False
+    edit_delay: float = Field(default=0.0, ge=0)
+    enable_coalesce: bool = False
+    coalesce_window: float = Field(default=1.0, gt=0)
+    rate_limit: RateLimitConfig = RateLimitConfig()
+    member_cache_ttl: float = Field(default=600.0, ge=0)
+    member_cache_size: int = Field(default=1024, ge=0)
+    scene_cache_ttl: float = Field(default=600.0, ge=0)
+    scene_cache_size: int = Field(default=256, ge=0)
     stop_command: str | set[str] = "stop"
     require_at: bool | RequireAtConfig = True
     matcher_priority: MatcherPriorityConfig = MatcherPriorityConfig()
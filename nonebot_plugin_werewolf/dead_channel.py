@@ -1,38 +1,77 @@
-import contextlib
+from collections import Counter
+from typing import ClassVar
 
 import anyio
 import anyio.lowlevel
 from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from nonebot.utils import escape_tag
 from nonebot_plugin_alconna import UniMessage
 
+from .clock import Clock, real_clock
 from .config import GameBehavior
 from .player import Player
 from .player_set import PlayerSet
+from .rate_limit import TokenBucket
+
+_Delivery = tuple[Player, UniMessage]  # (receiver, message)
 
 
 class DeadChannel:
+    workers: ClassVar[int] = 4
+    """并发转发消息的最大数量"""
+
     players: PlayerSet
     finished: anyio.Event
-    counter: dict[str, int]
+    clock: Clock
+    buckets: dict[str, TokenBucket]
+    members: list[Player]
+    """已加入死者频道的玩家, 按加入顺序排列"""
+    failed: Counter[str]
+    """各玩家转发失败的消息数"""
 
-    def __init__(self, players: PlayerSet, finished: anyio.Event) -> None:
+    def __init__(
+        self,
+        players: PlayerSet,
+        finished: anyio.Event,
+        clock: Clock = real_clock,
+    ) -> None:
         self.players = players
         self.finished = finished
-        self.counter = {p.user_id: 0 for p in players}
+        self.clock = clock
+        self.buckets = {}
+        self.members = []
+        self.failed = Counter()
 
-    async def _decrease(self, user_id: str) -> None:
-        await anyio.sleep(60)
-        self.counter[user_id] -= 1
+    def _allow(self, user_id: str) -> bool:
+        behavior = GameBehavior.get()
+        if (limit := behavior.dead_channel_rate_limit) <= 0:
+            return False
+
+        rate, burst = limit / 60, behavior.dead_channel_burst
+        bucket = self.buckets.get(user_id)
+        # 游戏中修改配置时按新配置重建令牌桶
+        if bucket is None or (bucket.rate, bucket.burst) != (rate, burst):
+            bucket = self.buckets[user_id] = TokenBucket(rate, burst)
+        return bucket.consume(self.clock.now()) == 0
 
     async def _broadcast(
-        self, stream: MemoryObjectReceiveStream[tuple[Player, UniMessage]]
+        self,
+        stream: MemoryObjectReceiveStream[tuple[Player, UniMessage]],
+        deliveries: MemoryObjectSendStream[_Delivery],
     ) -> None:
+        async with deliveries:
+            async for player, msg in stream:
+                for member in self.members:
+                    if member is not player:
+                        await deliveries.send((member, msg))
+
+    async def _deliver(self, stream: MemoryObjectReceiveStream[_Delivery]) -> None:
         async for player, msg in stream:
             try:
-                await self.players.killed().exclude(player).broadcast(msg)
+                await player.send(msg, skip_handler=True)
             except Exception as exc:
-                with contextlib.suppress(Exception):
-                    await player.send(f"消息转发失败: {exc!r}")
+                self.failed[player.user_id] += 1
+                player.log(f"<r>死者频道消息转发失败</r>: {escape_tag(repr(exc))}")
 
     async def _receive(
         self,
@@ -42,6 +81,7 @@ class DeadChannel:
         await player.killed.wait()
         await anyio.lowlevel.checkpoint()
         user_id = player.user_id
+        self.members.append(player)
 
         await player.send(
             "ℹ️你已加入死者频道，请勿在群组内继续发言\n"
@@ -54,11 +94,9 @@ class DeadChannel:
         async with stream:
             while True:
                 msg = await player.receive()
-                self.counter[user_id] += 1
-                self._task_group.start_soon(self._decrease, user_id)
 
                 # 发言频率限制
-                if self.counter[user_id] > GameBehavior.get().dead_channel_rate_limit:
+                if not self._allow(user_id):
                     await player.send("❌发言频率超过限制, 该消息被屏蔽")
                     continue
 
@@ -68,10 +106,17 @@ class DeadChannel:
 
     async def run(self) -> None:
         send, recv = anyio.create_memory_object_stream[tuple[Player, UniMessage]](16)
+        deliver_send, deliver_recv = anyio.create_memory_object_stream[_Delivery](
+            self.workers * 4
+        )
         async with anyio.create_task_group() as self._task_group:
             for p in self.players:
                 self._task_group.start_soon(self._receive, p, send.clone())
             send.close()
-            self._task_group.start_soon(self._broadcast, recv)
+            self._task_group.start_soon(self._broadcast, recv, deliver_send)
+            # 所有转发共用固定数量的 worker, 不再为每条消息创建任务组
+            for _ in range(self.workers):
+                self._task_group.start_soon(self._deliver, deliver_recv.clone())
+            deliver_recv.close()
             await self.finished.wait()
             self._task_group.cancel_scope.cancel()
@@ -1,33 +1,34 @@
 import contextlib
 import functools
-import itertools
 import secrets
+import time
 from collections import Counter
-from collections.abc import AsyncGenerator
-from typing import NoReturn, final
+from collections.abc import AsyncGenerator, Callable, Coroutine
+from typing import Any, NoReturn, final
 from typing_extensions import Self
 
 import anyio
-import nonebot
 from nonebot.utils import escape_tag
 from nonebot_plugin_alconna import At, Target, UniMessage
-from nonebot_plugin_alconna.uniseg.receipt import Receipt
-from nonebot_plugin_uninfo import Interface, SceneType
 
+from .clock import Clock
+from .config import config
 from .dead_channel import DeadChannel
 from .exception import GameFinished
+from .metrics import COUNT_BUCKETS, metrics
 from .models import GameContext, GameStatus, KillInfo, KillReason, Role, RoleGroup
 from .player import Player
-from .player_set import PlayerSet
+from .player_set import PlayerSet, Roster
+from .transport import Transport
 from .utils import (
     ConfigAccess,
     InputStore,
     LoggerWrapper,
-    SendHandler,
-    add_stop_button,
     link,
     logger_wrapper,
+    scene_cache,
 )
+from .victory import check_victory
 
 running_games: dict[Target, "Game"] = {}
 
@@ -36,52 +37,111 @@ def get_running_games() -> dict[Target, "Game"]:
     return running_games
 
 
+def _log_prefix(group_id: str, name: str | None, avatar: str | None) -> str:
+    prefix = f"<b><e>{escape_tag(group_id)}</e></b>"
+    if name is not None:
+        prefix = f"<y>{escape_tag(name)}</y>({prefix})"
+    return link(prefix, avatar)
+
+
 class GameRegistry:
     def __init__(self) -> None:
         self._games: dict[Target, Game] = {}
+        # (self_id, group_id) -> Game
+        self._groups: dict[tuple[str | None, str], Game] = {}
+        # (self_id, user_id) -> {group_id}
+        self._users: dict[tuple[str | None, str], set[str]] = {}
+
+    def _add(self, game: "Game") -> None:
+        group = game.group
+        self._games[group] = game
+        self._groups[(group.self_id, group.id)] = game
+        for player in game.players:
+            key = (group.self_id, player.user_id)
+            self._users.setdefault(key, set()).add(group.id)
+
+    def _remove(self, game: "Game") -> None:
+        group = game.group
+        if self._games.get(group) is game:
+            del self._games[group]
+        if self._groups.get(key := (group.self_id, group.id)) is game:
+            del self._groups[key]
+        for player in game.players:
+            key = (group.self_id, player.user_id)
+            if (groups := self._users.get(key)) is not None:
+                groups.discard(group.id)
+                if not groups:
+                    del self._users[key]
 
     @contextlib.asynccontextmanager
     async def register(self, game: "Game") -> AsyncGenerator["Game"]:
-        self._games[game.group] = game
+        self._add(game)
         try:
             yield game
         finally:
-            self._games.pop(game.group, None)
+            self._remove(game)
+
+    def has_player(self, self_id: str, user_id: str) -> bool:
+        return (self_id, user_id) in self._users
 
     def is_user_in_game(self, self_id: str, user_id: str, group_id: str | None) -> bool:
-        if group_id is None:
-            return any(
-                p.user.self_id == self_id and p.user_id == user_id
-                for p in itertools.chain.from_iterable(
-                    g.players for g in self._games.values()
-                )
-            )
-        for game in self._games.values():
-            if self_id == game.group.self_id and group_id == game.group.id:
-                return any(p.user_id == user_id for p in game.players)
-        return False
+        groups = self._users.get((self_id, user_id))
+        if not groups:
+            return False
+        return group_id is None or group_id in groups
 
     def has_running_games(self) -> bool:
         return bool(self._games)
 
+    def put_input(
+        self,
+        self_id: str,
+        msg: UniMessage,
+        user_id: str,
+        group_id: str | None = None,
+    ) -> None:
+        if group_id is not None:
+            if game := self._groups.get((self_id, group_id)):
+                game.inputs.put(msg, user_id, group_id)
+            return
+
+        for gid in self._users.get((self_id, user_id), ()):
+            if game := self._groups.get((self_id, gid)):
+                game.inputs.put(msg, user_id)
+
+    def input_gauges(self) -> dict[str, int]:
+        gauges = Counter[str]()
+        for game in self._games.values():
+            gauges.update(game.inputs.gauges())
+        return dict(gauges)
+
     def __contains__(self, target: Target) -> bool:
-        return any(target.verify(group) for group in self._games)
+        return self.get(target) is not None
 
     def get(self, group: Target) -> "Game | None":
-        for g, game in self._games.items():
-            if g.verify(group):
-                return game
+        game = self._groups.get((group.self_id, group.id))
+        if game is not None and game.group.verify(group):
+            return game
+        # self_id 缺失等无法命中索引的情况, 回退到逐个比对
+        if group.self_id is None:
+            for g, game in self._games.items():
+                if g.verify(group):
+                    return game
         return None
 
 
 game_registry = GameRegistry()
 
+INIT_PLAYERS_CONCURRENCY = 4
+"""初始化玩家时并发获取玩家信息的最大请求数"""
+FINAL_FLUSH_TIMEOUT = 10
+"""游戏结束时发送积压群聊消息的最长等待时间 (秒)"""
+
 
 async def init_players(
     game: "Game",
     players: set[str],
-    interface: Interface,
-) -> PlayerSet:
+) -> Roster:
     game.log.debug("初始化玩家职业")
 
     preset_data = game.preset
@@ -103,41 +163,49 @@ async def init_players(
         roles.remove(Role.CIVILIAN)
         roles.append(Role.JESTER)
 
-    player_set = PlayerSet()
-    for user_id in players:
-        role = roles.pop(secrets.randbelow(len(roles)))
-        player_set.add(await Player.new(role, game, user_id, interface))
+    # 先完成职业分配, 再并发获取玩家信息, 职业分配结果不受请求完成顺序影响
+    assigned = {
+        user_id: roles.pop(secrets.randbelow(len(roles))) for user_id in players
+    }
+    created: dict[str, Player] = {}
+    limiter = anyio.CapacityLimiter(INIT_PLAYERS_CONCURRENCY)
 
-    game.log.debug(f"职业分配完成: <e>{escape_tag(str(player_set))}</e>")
-    return player_set
+    async def create(user_id: str, role: Role) -> None:
+        async with limiter:
+            created[user_id] = await Player.new(role, game, user_id)
 
+    async with anyio.create_task_group() as tg:
+        for user_id, role in assigned.items():
+            tg.start_soon(create, user_id, role)
 
-class _SendHandler(SendHandler[str | None]):
-    def solve_msg(
-        self,
-        msg: UniMessage,
-        stop_btn_label: str | None = None,
-    ) -> UniMessage:
-        if stop_btn_label is not None:
-            msg = add_stop_button(msg, stop_btn_label)
-        return msg
+    player_set = Roster(created[user_id] for user_id in assigned)
+
+    game.log.debug(f"职业分配完成: <e>{escape_tag(str(player_set))}</e>")
+    return player_set
 
 
 class GameMessenger(ConfigAccess):
-    def __init__(self, group: Target, players: PlayerSet, log: LoggerWrapper) -> None:
+    def __init__(
+        self,
+        group: Target,
+        players: PlayerSet,
+        transport: Transport,
+        log: LoggerWrapper,
+    ) -> None:
         self.group = group
         self.player_map = {p.user_id: p for p in players}
+        self.inputs = transport.inputs
+        self.clock = transport.clock
         self.log = log
-        self._send_handler = _SendHandler(group)
-
-    async def send(
-        self,
-        message: str | UniMessage,
-        stop_btn_label: str | None = None,
-    ) -> Receipt:
-        if isinstance(message, str):
-            message = UniMessage.text(message)
-
+        self._send_handler = transport.sender(group)
+        # 合并发送: 积压的群聊消息
+        self._pending: UniMessage | None = None
+        self._pending_event = anyio.Event()
+        self._flush_lock = anyio.Lock()
+        if config.enable_coalesce:
+            self.inputs.before_wait = self.flush
+
+    def _log_send(self, message: UniMessage) -> None:
         text = ["<g>Send</g> | "]
         for seg in message:
             if isinstance(seg, At):
@@ -149,7 +217,76 @@ class GameMessenger(ConfigAccess):
                 text.append(escape_tag(str(seg)).replace("\n", "\\n"))
 
         self.log.info("".join(text))
-        return await self._send_handler.send(message, stop_btn_label)
+
+    def _take_pending(self) -> UniMessage | None:
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            self._pending_event = anyio.Event()
+        return pending
+
+    async def send(
+        self,
+        message: str | UniMessage,
+        stop_btn_label: str | None = None,
+    ) -> None:
+        """发送群聊消息
+
+        启用合并发送时, 消息可能暂存至积压队列并在稍后与其他消息合并发送,
+        因此不返回消息回执; 发送失败时抛出异常
+        """
+        if isinstance(message, str):
+            message = UniMessage.text(message)
+
+        self._log_send(message)
+        if not config.enable_coalesce:
+            await self._send_handler.send(message, stop_btn_label)
+            return
+
+        # 带有结束按钮的消息之后通常需要等待玩家输入, 与积压消息合并后立即发送
+        if stop_btn_label is not None:
+            async with self._flush_lock:
+                if (pending := self._take_pending()) is not None:
+                    message = pending + "\n\n" + message
+                await self._send_handler.send(message, stop_btn_label)
+            return
+
+        if self._pending is None:
+            self._pending = message
+            self._pending_event.set()
+        else:
+            self._pending = self._pending + "\n\n" + message
+
+    async def flush(self) -> None:
+        """立即发送积压的群聊消息"""
+        if self._pending is None:
+            return
+
+        async with self._flush_lock:
+            if (message := self._take_pending()) is not None:
+                await self._send_handler.send(message)
+
+    async def run(self, finished: anyio.Event) -> None:
+        if not config.enable_coalesce:
+            return
+
+        async def flush_loop() -> None:
+            while True:
+                await self._pending_event.wait()
+                await self.clock.sleep(config.coalesce_window)
+                await self.flush()
+
+        try:
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(flush_loop)
+                await finished.wait()
+                tg.cancel_scope.cancel()
+        finally:
+            # 游戏被中止时外层已取消, 屏蔽取消以发送剩余的积压消息
+            with (
+                anyio.CancelScope(shield=True),
+                self.clock.move_on_after(FINAL_FLUSH_TIMEOUT),
+            ):
+                await self.flush()
 
     async def wait_stop(
         self,
@@ -158,10 +295,12 @@ class GameMessenger(ConfigAccess):
     ) -> None:
         if timeout_secs is None:
             timeout_secs = self.behavior.timeout.speak
-        with anyio.move_on_after(timeout_secs):
+        with self.clock.move_on_after(timeout_secs):
             async with anyio.create_task_group() as tg:
                 for p in players:
-                    tg.start_soon(InputStore.fetch_until_stop, p.user_id, self.group.id)
+                    tg.start_soon(
+                        self.inputs.fetch_until_stop, p.user_id, self.group.id
+                    )
 
     async def notify_player_role(self, players: PlayerSet) -> None:
         msg = UniMessage()
@@ -189,19 +328,29 @@ class GameMessenger(ConfigAccess):
 
 class Game(ConfigAccess):
     group: Target
+    transport: Transport
+    clock: Clock
     log: LoggerWrapper
-    players: PlayerSet
+    players: Roster
     context: GameContext
+    inputs: InputStore
     messenger: GameMessenger
     killed_players: list[tuple[str, KillInfo]]
     finished: anyio.Event
+    status: GameStatus | None
+    """游戏结果, 游戏未正常结束时为 None"""
 
-    def __init__(self, group: Target) -> None:
+    def __init__(self, group: Target, transport: Transport) -> None:
         self.group = group
+        self.transport = transport
+        self.clock = transport.clock
         self.context = GameContext(0)
+        self.inputs = transport.inputs
         self.killed_players = []
         self.finished = anyio.Event()
+        self.status = None
         self._task_group = None
+        self._phase: tuple[str, float, int] | None = None
 
     @final
     @classmethod
@@ -209,23 +358,40 @@ class Game(ConfigAccess):
         cls,
         group: Target,
         players: set[str],
-        interface: Interface,
+        transport: Transport,
     ) -> Self:
-        scene = await interface.get_scene(SceneType.GROUP, group.id)
-        if scene is None:
-            scene = await interface.get_scene(SceneType.GUILD, group.id)
-        name = f"<b><e>{escape_tag(group.id)}</e></b>"
-        if scene is not None and scene.name is not None:
-            name = f"<y>{escape_tag(scene.name)}</y>({name})"
-        log_prefix = link(name, scene.avatar if scene is not None else None)
-
-        self = cls(group)
-        self.log = logger_wrapper(log_prefix)
-        self.players = await init_players(self, players, interface)
-        self.messenger = GameMessenger(group, self.players, self.log)
+        self = cls(group, transport)
+        cached = (
+            scene_cache.get(group.self_id, group.id)
+            if group.self_id is not None
+            else None
+        )
+        self.log = logger_wrapper(_log_prefix(group.id, *(cached or (None, None))))
+        if cached is None:
+            # 群聊信息仅用于日志显示, 在后台获取, 不阻塞游戏开始
+            transport.start_soon(self._update_log_prefix)
+        self.players = await init_players(self, players)
+        self.messenger = GameMessenger(group, self.players.members, transport, self.log)
 
         return self
 
+    async def _update_log_prefix(self) -> None:
+        try:
+            info = await self.transport.get_scene(self.group.id)
+        except Exception as err:
+            self.log.debug(f"获取群聊信息失败: {escape_tag(repr(err))}")
+        else:
+            self.log.prefix = _log_prefix(self.group.id, *info)
+
+    def _enter_phase(self, phase: str | None) -> None:
+        """结束当前阶段的计时, 记录耗时与 API 调用次数, 并开始下一阶段"""
+        now, calls = time.perf_counter(), self.transport.api_calls
+        if self._phase is not None:
+            name, start, start_calls = self._phase
+            metrics.observe("phase.duration", now - start, name)
+            metrics.observe("phase.api_calls", calls - start_calls, name, COUNT_BUCKETS)
+        self._phase = None if phase is None else (phase, now, calls)
+
     @functools.cached_property
     def group_id(self) -> str:
         return self.group.id
@@ -235,22 +401,8 @@ class Game(ConfigAccess):
         return self.players.shuffled
 
     def raise_for_status(self) -> None:
-        players = self.players.alive()
-        w = players.select(RoleGroup.WEREWOLF)
-        p = players.exclude(RoleGroup.WEREWOLF)
-
-        # 狼人数量大于其他职业数量
-        if w.size >= p.size:
-            raise GameFinished(GameStatus.WEREWOLF)
-        # 屠边-村民/中立全灭
-        if not p.select(Role.CIVILIAN, RoleGroup.OTHERS).size:
-            raise GameFinished(GameStatus.WEREWOLF)
-        # 屠边-神职全灭
-        if not p.exclude(Role.CIVILIAN, RoleGroup.OTHERS).size:
-            raise GameFinished(GameStatus.WEREWOLF)
-        # 狼人全灭
-        if not w.size:
-            raise GameFinished(GameStatus.GOODGUY)
+        if (status := check_victory(self.players.counter)) is not None:
+            raise GameFinished(status)
 
     async def post_kill(self, players: Player | PlayerSet) -> None:
         if isinstance(players, Player):
@@ -277,6 +429,7 @@ class Game(ConfigAccess):
                 await self.post_kill(shoot)
 
     async def run_night(self, players: PlayerSet) -> None:
+        await self.messenger.flush()
         async with anyio.create_task_group() as tg:
             for p in players:
                 tg.start_soon(p.interact)
@@ -334,6 +487,7 @@ class Game(ConfigAccess):
         # 筛选当前存活玩家
         players = self.players.alive()
 
+        await self.messenger.flush()
         # 被票玩家: [投票玩家]
         vote_result: dict[Player, list[Player]] = await players.vote()
         # 票数: [被票玩家]
@@ -399,11 +553,13 @@ class Game(ConfigAccess):
 
     async def mainloop(self) -> NoReturn:
         # 告知玩家角色信息
-        await self.messenger.notify_player_role(self.players)
+        self._enter_phase("notify")
+        await self.messenger.notify_player_role(self.players.members)
 
         # 游戏主循环
         while True:
             # 重置游戏状态，进入下一夜
+            self._enter_phase("night")
             self.context.reset()
             self.context.state = GameContext.State.NIGHT
             await self.messenger.send("🌙天黑请闭眼...")
@@ -413,6 +569,7 @@ class Game(ConfigAccess):
             await self.run_night(players)
 
             # 公告
+            self._enter_phase("day")
             self.context.day += 1
             self.context.state = GameContext.State.DAY
             msg = UniMessage.text(f"『第{self.context.day}天』☀️天亮了...\n")
@@ -451,9 +608,11 @@ class Game(ConfigAccess):
             )
 
             # 开始自由讨论
+            self._enter_phase("discussion")
             await self.run_discussion()
 
             # 开始投票
+            self._enter_phase("vote")
             await self.messenger.send(
                 "🗳️讨论结束, 进入投票环节, "
                 f"限时{self.behavior.timeout.vote / 60:.1f}分钟\n"
@@ -466,6 +625,7 @@ class Game(ConfigAccess):
             self.raise_for_status()
 
     async def handle_game_finish(self, status: GameStatus) -> None:
+        self._enter_phase("finish")
         msg = UniMessage.text(f"🎉游戏结束，{status.display}获胜\n\n")
         for p in sorted(self.players, key=lambda p: (p.role.value, p.user_id)):
             msg.at(p.user_id).text(f": {p.role_name}\n")
@@ -484,32 +644,45 @@ class Game(ConfigAccess):
             self.log.warning("的狼人杀游戏进程被取消")
             raise
         except GameFinished as result:
+            self.status = result.status
             await self.handle_game_finish(result.status)
             self.log.info("狼人杀游戏进程正常退出")
         except Exception as exc:
             self.log.exception("狼人杀游戏进程出现未知错误")
             await self.messenger.send(f"❌狼人杀游戏进程出现未知错误: {exc!r}")
         finally:
+            self._enter_phase(None)
             self.finished.set()
 
     async def run(self) -> None:
-        dead_channel = DeadChannel(self.players, self.finished)
+        dead_channel = DeadChannel(self.players.members, self.finished, self.clock)
 
         try:
             async with (
                 game_registry.register(self),
                 anyio.create_task_group() as self._task_group,
             ):
+                self.transport.task_group = self._task_group
                 self._task_group.start_soon(dead_channel.run)
+                self._task_group.start_soon(self.messenger.run, self.finished)
                 await self.run_daemon()
         except Exception:
             self.log.exception("狼人杀守护进程出现错误")
         finally:
-            self._task_group = None
-            InputStore.cleanup((p.user_id for p in self.players), self.group_id)
+            self._task_group = self.transport.task_group = None
+            self.inputs.close()
 
     def start(self) -> None:
-        nonebot.get_driver().task_group.start_soon(self.run)
+        self.transport.start_soon(self.run)
+
+    def start_soon(
+        self, func: Callable[..., Coroutine[Any, Any, Any]], *args: object
+    ) -> None:
+        """在游戏进程中运行后台任务, 游戏结束或中止时随之取消"""
+        if self._task_group is not None:
+            self._task_group.start_soon(func, *args)
+        else:
+            self.transport.start_soon(func, *args)
 
     def terminate(self) -> None:
         if self._task_group is not None:
@@ -23,7 +23,7 @@ from nonebot_plugin_uninfo import Uninfo
 
 from ..config import PresetData
 from ..utils import SendHandler as BaseSendHandler
-from ..utils import btn, extract_session_member_nick
+from ..utils import btn, extract_session_member_nick, member_cache
 from .depends import rule_not_in_game
 
 preparing_games: dict[Target, "PrepareGame"] = {}
@@ -42,6 +42,7 @@ def solve_button(msg: UniMessage) -> UniMessage:
 
 class SendHandler(BaseSendHandler):
     def __init__(self) -> None:
+        super().__init__()
         self.reply_to = True
 
     def solve_msg(self, msg: UniMessage) -> UniMessage:
@@ -54,7 +55,7 @@ class SendHandler(BaseSendHandler):
             .keyboard(btn("重开上次游戏", "werewolf restart"))
         )
         async with anyio.create_task_group() as tg:
-            tg.start_soon(self._edit)
+            tg.start_soon(self._edit, self._take_last())
             tg.start_soon(self._send, msg)
 
 
@@ -69,6 +70,7 @@ def create_waiter(group: Target) -> AsyncIterator[tuple[Event | None, str, str]]
     )
     def wait(event: Event, msg: UniMsg, session: Uninfo) -> tuple[Event, str, str]:
         text = msg.extract_plain_text().strip()
+        member_cache.update_from_session(session, group.id)
         name = (
             re.sub(r"[\u2066-\u2069]", "", (extract_session_member_nick(session) or ""))
             or event.get_user_id()
@@ -8,6 +8,14 @@ async def rule_in_game(bot: Bot, event: Event) -> bool:
     if not game_registry.has_running_games():
         return False
 
+    # 先使用适配器提供的原始用户 ID 过滤非玩家消息, 避免构造 Target
+    try:
+        user_id = event.get_user_id()
+    except Exception:
+        return False
+    if not game_registry.has_player(bot.self_id, user_id):
+        return False
+
     try:
         target = get_target(event, bot)
     except NotImplementedError:
@@ -16,11 +24,6 @@ async def rule_in_game(bot: Bot, event: Event) -> bool:
     if target.private:
         return game_registry.is_user_in_game(bot.self_id, target.id, None)
 
-    try:
-        user_id = event.get_user_id()
-    except Exception:
-        return False
-
     return game_registry.is_user_in_game(bot.self_id, user_id, target.id)
 
 
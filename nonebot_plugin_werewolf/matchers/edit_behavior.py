@@ -52,6 +52,12 @@ alc = Alconna(
         alias={"死亡聊天"},
         help_text="设置死亡玩家发言频率限制",
     ),
+    Subcommand(
+        "dead_chat_burst",
+        Args["burst#连续发言次数", int],
+        alias={"死亡聊天突发"},
+        help_text="设置死亡玩家允许连续发言的次数",
+    ),
     Subcommand(
         "werewolf_multi_select",
         Args["enabled#是否启用", bool],
@@ -107,6 +113,7 @@ alc = Alconna(
             "狼人杀配置 显示职业 true\n"
             "狼人杀配置 发言顺序 false\n"
             "狼人杀配置 死亡聊天 30\n"
+            "狼人杀配置 死亡聊天突发 5\n"
             "狼人杀配置 超时 准备 300"
         ),
     ),
@@ -140,6 +147,14 @@ async def set_dead_chat(behavior: Behavior, limit: int) -> None:
     await finish(f"已设置死亡玩家发言限制为 {limit} 次/分钟")
 
 
+@edit_behavior.assign("dead_chat_burst")
+async def set_dead_chat_burst(behavior: Behavior, burst: int) -> None:
+    if burst < 1:
+        await finish("连续发言次数必须大于零")
+    behavior.dead_channel_burst = burst
+    await finish(f"已设置死亡玩家允许连续发言 {burst} 次")
+
+
 @edit_behavior.assign("werewolf_multi_select")
 async def set_werewolf_multi_select(behavior: Behavior, enabled: bool) -> None:
     behavior.werewolf_multi_select = enabled
@@ -206,6 +221,7 @@ async def handle_default(behavior: Behavior) -> None:
         f"游戏开始发送职业列表: {'是' if behavior.show_roles_list_on_start else '否'}",
         f"白天讨论按顺序发言: {'是' if behavior.speak_in_turn else '否'}",
         f"死亡玩家发言转发限制: {behavior.dead_channel_rate_limit} 次/分钟",
+        f"死亡玩家连续发言次数: {behavior.dead_channel_burst} 次",
         f"狼人多选(意见未统一时随机选择已选玩家): {'是' if behavior.werewolf_multi_select else '否'}",  # noqa: E501
         "",
         "超时时间设置:",
@@ -1,10 +1,10 @@
 from nonebot import on_message
-from nonebot.adapters import Event
+from nonebot.adapters import Bot, Event
 from nonebot_plugin_alconna import Alconna, MsgTarget, UniMessage, UniMsg, on_alconna
 
 from ..config import config
 from ..constant import STOP_COMMAND
-from ..utils import InputStore
+from ..game import game_registry
 from .depends import rule_in_game
 
 message_in_game = on_message(
@@ -14,11 +14,11 @@ message_in_game = on_message(
 
 
 @message_in_game.handle()
-async def handle_input(event: Event, target: MsgTarget, msg: UniMsg) -> None:
+async def handle_input(bot: Bot, event: Event, target: MsgTarget, msg: UniMsg) -> None:
     if target.private:
-        InputStore.put(msg, target.id)
+        game_registry.put_input(bot.self_id, msg, target.id)
     else:
-        InputStore.put(msg, event.get_user_id(), target.id)
+        game_registry.put_input(bot.self_id, msg, event.get_user_id(), target.id)
 
 
 stopcmd = on_alconna(
@@ -32,5 +32,10 @@ stopcmd = on_alconna(
 
 
 @stopcmd.handle()
-async def handle_stopcmd(event: Event, target: MsgTarget) -> None:
-    await handle_input(event=event, target=target, msg=UniMessage.text(STOP_COMMAND))
+async def handle_stopcmd(bot: Bot, event: Event, target: MsgTarget) -> None:
+    await handle_input(
+        bot=bot,
+        event=event,
+        target=target,
+        msg=UniMessage.text(STOP_COMMAND),
+    )
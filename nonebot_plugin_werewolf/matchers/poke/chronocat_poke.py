@@ -7,7 +7,7 @@ from nonebot_plugin_alconna import MsgTarget, UniMessage
 from ...config import config
 from ...constant import STOP_COMMAND
 from ...game import game_registry
-from ...utils import InputStore
+from ...utils import member_cache
 from .._prepare_game import preparing_games
 
 
@@ -54,8 +54,9 @@ with contextlib.suppress(ImportError, RuntimeError):
         )
 
     @on_message(rule=_rule_poke_stop).handle()
-    async def handle_poke_stop(event: MessageCreatedEvent) -> None:
-        InputStore.put(
+    async def handle_poke_stop(bot: Bot, event: MessageCreatedEvent) -> None:
+        game_registry.put_input(
+            bot.self_id,
             UniMessage.text(STOP_COMMAND),
             extract_poke_tome(event) or event.get_user_id(),
             extract_user_group(event)[1],
@@ -90,7 +91,7 @@ with contextlib.suppress(ImportError, RuntimeError):
             # XXX:
             #   截止 chronocat v0.2.19
             #   通过 guild.member.get / user.get 获取的用户信息均不包含用户名
-            #   跳过用户名获取, 使用用户 ID 代替
+            #   跳过用户名获取, 优先使用缓存的昵称, 否则使用用户 ID 代替
             #
             # member = await bot.guild_member_get(
             #     guild_id=(event.guild and event.guild.id) or event.channel.id,
@@ -104,7 +105,8 @@ with contextlib.suppress(ImportError, RuntimeError):
             #     name = user.nick or user.name
             # players[user_id] = name or user_id
 
-            players[user_id] = user_id
+            cached = member_cache.get(bot.self_id, target.id, user_id)
+            players[user_id] = cached[0] if cached else user_id
             await UniMessage.at(user_id).text("\n✅成功加入游戏").send(target, bot)
 
     def chronocat_poke_enabled() -> bool:
@@ -7,7 +7,7 @@ from nonebot_plugin_alconna import MsgTarget, UniMessage
 from ...config import config
 from ...constant import STOP_COMMAND
 from ...game import game_registry
-from ...utils import InputStore
+from ...utils import member_cache
 from .._prepare_game import preparing_games
 
 
@@ -31,8 +31,9 @@ with contextlib.suppress(ImportError, RuntimeError):
         )
 
     @on_notice(rule=_rule_poke_stop).handle()
-    async def handle_poke_stop(event: PokeNotifyEvent) -> None:
-        InputStore.put(
+    async def handle_poke_stop(bot: Bot, event: PokeNotifyEvent) -> None:
+        game_registry.put_input(
+            self_id=bot.self_id,
             msg=UniMessage.text(STOP_COMMAND),
             user_id=str(event.user_id),
             group_id=str(event.group_id) if event.group_id is not None else None,
@@ -65,12 +66,18 @@ with contextlib.suppress(ImportError, RuntimeError):
         if event.group_id is None or user_id in players:
             return
 
-        member_info = await bot.get_group_member_info(
-            group_id=event.group_id,
-            user_id=event.user_id,
-            no_cache=True,
-        )
-        players[user_id] = member_info["card"] or member_info["nickname"] or user_id
+        if cached := member_cache.get(bot.self_id, target.id, user_id):
+            players[user_id] = cached[0]
+        else:
+            member_info = await bot.get_group_member_info(
+                group_id=event.group_id,
+                user_id=event.user_id,
+                no_cache=True,
+            )
+            name = member_info["card"] or member_info["nickname"]
+            if name:
+                member_cache.set(bot.self_id, target.id, user_id, name)
+            players[user_id] = name or user_id
         await UniMessage.at(user_id).text("\n✅成功加入游戏").send(target, bot)
 
     def ob11_poke_enabled() -> bool:
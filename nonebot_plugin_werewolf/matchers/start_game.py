@@ -17,6 +17,7 @@ from nonebot_plugin_uninfo import QryItrface, Uninfo
 
 from ..config import GameBehavior, config, stop_command_prompt
 from ..game import Game, game_registry
+from ..transport import NonebotTransport
 from ..utils import extract_session_member_nick
 from ._prepare_game import PrepareGame, solve_button
 from .depends import rule_not_in_game
@@ -118,5 +119,5 @@ async def handle_start(
         await UniMessage.text("⚠️游戏准备超时，已自动结束").finish(reply_to=True)
 
     dump_players(target, players)
-    game = await Game.new(target, set(players), interface)
+    game = await Game.new(target, set(players), NonebotTransport(interface))
     game.start()
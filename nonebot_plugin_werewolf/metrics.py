@@ -0,0 +1,119 @@
+import bisect
+import contextlib
+import time
+from collections import Counter
+from collections.abc import Generator
+from typing import Any
+
+DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600)
+"""耗时直方图的桶上界 (秒)"""
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+"""次数直方图的桶上界"""
+
+
+class Histogram:
+    __slots__ = ("bounds", "buckets", "count", "max", "sum")
+
+    bounds: tuple[float, ...]
+    buckets: list[int]
+    """各区间 `(bounds[i-1], bounds[i]]` 的观测数, 最后一项为超出上界的观测数"""
+    count: int
+    sum: float
+    max: float
+
+    def __init__(self, bounds: tuple[float, ...] = DURATION_BUCKETS) -> None:
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """返回分位数所在桶的上界, 超出所有上界时返回最大观测值"""
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds, self.buckets, strict=False):
+            seen += n
+            if seen >= rank and seen > 0:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.mean,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+_Key = tuple[str, str]  # (name, label)
+
+
+class MetricsRegistry:
+    """进程内的游戏指标, 按名称与标签 (阶段、职业等) 聚合"""
+
+    histograms: dict[_Key, Histogram]
+    counters: Counter[_Key]
+
+    def __init__(self) -> None:
+        self.histograms = {}
+        self.counters = Counter()
+
+    def histogram(
+        self,
+        name: str,
+        label: str = "",
+        bounds: tuple[float, ...] = DURATION_BUCKETS,
+    ) -> Histogram:
+        if (hist := self.histograms.get((name, label))) is None:
+            hist = self.histograms[(name, label)] = Histogram(bounds)
+        return hist
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        label: str = "",
+        bounds: tuple[float, ...] = DURATION_BUCKETS,
+    ) -> None:
+        self.histogram(name, label, bounds).observe(value)
+
+    def inc(self, name: str, label: str = "", value: int = 1) -> None:
+        self.counters[(name, label)] += value
+
+    @contextlib.contextmanager
+    def timer(self, name: str, label: str = "") -> Generator[None]:
+        """记录代码块的耗时 (秒)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, label)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        result: dict[str, dict[str, Any]] = {}
+        for (name, label), hist in sorted(self.histograms.items()):
+            result.setdefault(name, {})[label] = hist.snapshot()
+        for (name, label), value in sorted(self.counters.items()):
+            result.setdefault(name, {})[label] = value
+        return result
+
+    def clear(self) -> None:
+        self.histograms.clear()
+        self.counters.clear()
+
+
+metrics = MetricsRegistry()
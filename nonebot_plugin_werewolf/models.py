@@ -7,6 +7,7 @@ import anyio
 
 if TYPE_CHECKING:
     from .player import Player
+    from .players.werewolf import WerewolfTeamChat
 
 
 class Role(int, Enum):
@@ -27,6 +28,11 @@ class Role(int, Enum):
     # 平民
     CIVILIAN = 0
 
+    @functools.cached_property
+    def flag(self) -> int:
+        """职业位标志, 与 `RoleGroup.flag` 互不重叠"""
+        return 1 << list(Role).index(self)
+
     @functools.cached_property
     def emoji(self) -> str:
         from .constant import ROLE_EMOJI
@@ -45,6 +51,11 @@ class RoleGroup(Enum):
     GOODGUY = auto()
     OTHERS = auto()
 
+    @functools.cached_property
+    def flag(self) -> int:
+        """阵营位标志, 位于所有职业位标志之后"""
+        return 1 << (len(Role) + list(RoleGroup).index(self))
+
     @functools.cached_property
     def display(self) -> str:
         from .constant import ROLE_NAME_CONV
@@ -52,6 +63,15 @@ class RoleGroup(Enum):
         return ROLE_NAME_CONV[self]
 
 
+@functools.cache
+def role_mask(*types: Role | RoleGroup) -> int:
+    """合并职业/阵营位标志, 结果按参数缓存"""
+    mask = 0
+    for t in types:
+        mask |= t.flag
+    return mask
+
+
 class KillReason(Enum):
     WEREWOLF = auto()
     POISON = auto()
@@ -77,7 +97,7 @@ class GameStatus(Enum):
         return GAME_STATUS_CONV[self]
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class GameContext:
     class State(Enum):
         DAY = auto()
@@ -102,6 +122,8 @@ class GameContext:
     """当晚使用了毒药的女巫"""
     protected: set["Player"] = dataclasses.field(default_factory=set)
     """当晚守卫保护的目标"""
+    werewolf_chat: "WerewolfTeamChat | None" = None
+    """当晚狼人阵营的交流频道"""
 
     def reset(self) -> None:
         self.werewolf_finished = anyio.Event()
@@ -111,6 +133,7 @@ class GameContext:
         self.antidote = set()
         self.poison = set()
         self.protected = set()
+        self.werewolf_chat = None
 
     def werewolf_start(self) -> None:
         self._werewolf_interact_count += 1
@@ -122,7 +145,35 @@ class GameContext:
         return self.werewolf_finished.is_set()
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class KillInfo:
     reason: KillReason
     killers: list[str]
+
+
+@dataclasses.dataclass
+class AliveCounter:
+    """存活玩家按阵营分类的计数, 由 `Roster` 在玩家死亡时维护"""
+
+    werewolf: int = 0
+    """狼人阵营"""
+    civilian: int = 0
+    """平民"""
+    god: int = 0
+    """神职, 即除平民外的好人阵营"""
+    others: int = 0
+    """中立阵营"""
+
+    @property
+    def non_werewolf(self) -> int:
+        return self.civilian + self.god + self.others
+
+    def add(self, role: Role, role_group: RoleGroup, delta: int = 1) -> None:
+        if role_group == RoleGroup.WEREWOLF:
+            self.werewolf += delta
+        elif role_group == RoleGroup.OTHERS:
+            self.others += delta
+        elif role == Role.CIVILIAN:
+            self.civilian += delta
+        else:
+            self.god += delta
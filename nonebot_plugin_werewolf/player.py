@@ -1,4 +1,4 @@
-import functools
+import time
 import weakref
 from types import EllipsisType
 from typing import TYPE_CHECKING, ClassVar, Final, Generic, TypeVar, final
@@ -8,24 +8,23 @@ import anyio
 import nonebot
 from nonebot.utils import escape_tag
 from nonebot_plugin_alconna.uniseg import Receipt, Target, UniMessage
-from nonebot_plugin_uninfo import Interface, SceneType
 
 from .config import GameBehavior, stop_command_prompt
 from .constant import STOP_COMMAND
+from .metrics import COUNT_BUCKETS, metrics
 from .models import KillInfo, KillReason, Role, RoleGroup
 from .utils import (
     ConfigAccess,
-    InputStore,
-    SendHandler,
     add_players_button,
-    add_stop_button,
     check_index,
     link,
+    member_cache,
 )
 
 if TYPE_CHECKING:
     from .game import Game
     from .player_set import PlayerSet
+    from .transport import Sender, Transport
 
 
 logger = nonebot.logger.opt(colors=True)
@@ -98,43 +97,48 @@ class NotifyProvider(ActionProvider[_P], Generic[_P]):
         await self.p.send(self.message(msg))
 
 
-class _SendHandler(SendHandler[str | None]):
-    def solve_msg(
-        self,
-        msg: UniMessage,
-        stop_btn_label: str | None = None,
-    ) -> UniMessage:
-        if stop_btn_label is not None:
-            msg = add_stop_button(msg, stop_btn_label)
-        return msg
-
-
 async def _get_user_name(
-    interface: Interface, group_id: str, user_id: str
+    transport: "Transport", self_id: str | None, group_id: str, user_id: str
 ) -> tuple[str, str]:
-    member = await interface.get_member(SceneType.GROUP, group_id, user_id)
-    if member is None:
-        member = await interface.get_member(SceneType.GUILD, group_id, user_id)
-
-    nick = (
-        (member.nick or member.user.nick or member.user.name)
-        if member is not None
-        else None
-    )
+    # 无法确定 bot 时不使用缓存, 避免不同 bot 的成员信息共用同一缓存键
+    if (
+        self_id is not None
+        and (cached := member_cache.get(self_id, group_id, user_id)) is not None
+    ):
+        nick, avatar = cached
+    else:
+        info = await transport.get_member(group_id, user_id)
+        nick, avatar = info or (None, None)
+        if nick and self_id is not None:
+            member_cache.set(self_id, group_id, user_id, nick, avatar)
 
     colored = f"<b><e>{escape_tag(user_id)}</e></b>"
     if nick:
         colored = f"<y>{escape_tag(nick)}</y>({colored})"
-    colored = link(colored, member and member.user.avatar)
+    colored = link(colored, avatar)
 
     return nick or user_id, colored
 
 
 class Player(ConfigAccess):
+    __slots__ = (
+        "__game_ref",
+        "_handler",
+        "_killed",
+        "alive",
+        "colored_name",
+        "kill_info",
+        "name",
+        "selected",
+        "user",
+    )
+
     _player_class: ClassVar[dict[Role, type["Player"]]] = {}
 
     role: ClassVar[Role]
     role_group: ClassVar[RoleGroup]
+    role_flags: ClassVar[int]
+    """`role.flag | role_group.flag`, 用于按职业/阵营快速筛选玩家"""
     interact_provider: ClassVar[type[InteractProvider[Self]] | None]
     kill_provider: ClassVar[type[KillProvider[Self]]]
     notify_provider: ClassVar[type[NotifyProvider[Self]]]
@@ -142,10 +146,11 @@ class Player(ConfigAccess):
     user: Final[Target]
     name: str
     colored_name: str
-    alive: bool = True
-    killed: Final[anyio.Event]
-    kill_info: KillInfo | None = None
-    selected: "Player | None" = None
+    alive: bool
+    kill_info: KillInfo | None
+    selected: "Player | None"
+    _killed: anyio.Event | None
+    _handler: "Sender | None"
 
     @final
     @override
@@ -156,6 +161,7 @@ class Player(ConfigAccess):
 
         assert cls.role not in cls._player_class  # noqa: S101
         cls._player_class[cls.role] = cls
+        cls.role_flags = cls.role.flag | cls.role_group.flag
         for k, v in {
             "interact_provider": None,
             "kill_provider": KillProvider,
@@ -168,8 +174,15 @@ class Player(ConfigAccess):
     def __init__(self, game: "Game", user: Target) -> None:
         self.__game_ref = weakref.ref(game)
         self.user = user
-        self.killed = anyio.Event()
-        self._send_handler = _SendHandler(self.user)
+        self.alive = True
+        self.kill_info = None
+        self.selected = None
+        self._killed = None
+        self._handler = None
+        self.setup()
+
+    def setup(self) -> None:
+        """初始化子类的额外状态, 子类需在 `__slots__` 中声明对应属性"""
 
     @final
     @classmethod
@@ -178,7 +191,6 @@ class Player(ConfigAccess):
         role: Role,
         game: "Game",
         user_id: str,
-        interface: Interface,
     ) -> "Player":
         if role not in cls._player_class:
             raise ValueError(f"Unexpected role: {role!r}")
@@ -193,7 +205,7 @@ class Player(ConfigAccess):
         )
         self = cls._player_class[role](game, user)
         self.name, self.colored_name = await _get_user_name(
-            interface, game.group_id, user_id
+            game.transport, game.group.self_id, game.group_id, user_id
         )
         return self
 
@@ -208,15 +220,34 @@ class Player(ConfigAccess):
         raise ValueError("Game not exist")
 
     @final
-    @functools.cached_property
+    @property
     def user_id(self) -> str:
         return self.user.id
 
     @final
-    @functools.cached_property
+    @property
     def role_name(self) -> str:
         return self.role.display
 
+    @final
+    @property
+    def killed(self) -> anyio.Event:
+        """玩家完成死亡结算时设置, 首次访问时创建"""
+        if self._killed is None:
+            self._killed = anyio.Event()
+        return self._killed
+
+    @final
+    @property
+    def is_killed(self) -> bool:
+        return self._killed is not None and self._killed.is_set()
+
+    @property
+    def _send_handler(self) -> "Sender":
+        if self._handler is None:
+            self._handler = self.game.transport.sender(self.user)
+        return self._handler
+
     @final
     def log(self, text: str) -> None:
         text = text.replace("\n", "\\n")
@@ -230,7 +261,7 @@ class Player(ConfigAccess):
         stop_btn_label: str | None = None,
         select_players: "PlayerSet | None" = None,
         skip_handler: bool = False,
-    ) -> Receipt:
+    ) -> Receipt | None:
         if isinstance(message, str):
             message = UniMessage.text(message)
 
@@ -239,12 +270,12 @@ class Player(ConfigAccess):
         if select_players:
             message = add_players_button(message, select_players)
         if skip_handler:
-            return await message.send(self.user)
+            return await self._send_handler.send_direct(message)
         return await self._send_handler.send(message, stop_btn_label)
 
     @final
     async def receive(self) -> UniMessage:
-        result = await InputStore.fetch(self.user_id)
+        result = await self.game.transport.receive(self.user_id)
         self.log(f"<y>Recv</y> | {escape_tag(str(result))}")
         return result
 
@@ -267,32 +298,49 @@ class Player(ConfigAccess):
             return
 
         provider = self.interact_provider(self)
+        # 交互开始前积压的私聊消息不作为本次交互的输入
+        self.game.inputs.discard(self.user_id)
 
+        start, calls = time.perf_counter(), self._send_handler.calls
         await provider.before()
         timeout = self.interact_timeout
         await self.send(f"✏️{self.role_name}交互开始，限时 {timeout / 60:.2f} 分钟")
 
-        with anyio.move_on_after(timeout) as scope:
+        with self.game.clock.move_on_after(timeout) as scope:
             await provider.interact()
         if scope.cancelled_caught:
             logger.debug(f"{self.role_name}交互超时 (<y>{timeout}</y>s)")
+            metrics.inc("interact.timeout", self.role.name)
             await self.send(f"⚠️{self.role_name}交互超时")
 
         await provider.after()
+        metrics.observe(
+            "interact.duration", time.perf_counter() - start, self.role.name
+        )
+        metrics.observe(
+            "interact.api_calls",
+            self._send_handler.calls - calls,
+            self.role.name,
+            COUNT_BUCKETS,
+        )
 
     async def notify_role(self) -> None:
         await self.notify_provider(self).notify()
 
     @final
     async def kill(self, reason: KillReason, *killers: "Player") -> KillInfo | None:
-        return await self.kill_provider(self).kill(reason, *killers)
+        kill_info = await self.kill_provider(self).kill(reason, *killers)
+        self.game.players.refresh(self)
+        return kill_info
 
     @final
     async def post_kill(self) -> None:
         await self.kill_provider(self).post_kill()
         self.killed.set()
+        self.game.players.refresh(self)
 
     async def vote(self, players: "PlayerSet") -> "Player | None":
+        self.game.inputs.discard(self.user_id)
         await self.send(
             f"💫请选择需要投票的玩家:\n"
             f"{players.show()}\n\n"
@@ -304,7 +352,7 @@ class Player(ConfigAccess):
         )
 
         selected = None
-        with anyio.move_on_after(self.vote_timeout) as scope:
+        with self.game.clock.move_on_after(self.vote_timeout) as scope:
             selected = await self.select_player(
                 players,
                 on_stop="⚠️你选择了弃票",
@@ -1,17 +1,34 @@
 import functools
+import itertools
 import random
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable, Iterator
 from collections.abc import Set as AbstractSet
 from typing_extensions import Self
 
 import anyio
-from nonebot_plugin_alconna.uniseg import UniMessage
+from nonebot_plugin_alconna.uniseg import Button, UniMessage
 
-from .models import Role, RoleGroup
+from .models import AliveCounter, Role, RoleGroup, role_mask
 from .player import Player
+from .utils import btn
 
 
-class PlayerSet(set[Player]):
+def _compile_types(
+    types: tuple[Player | Role | RoleGroup, ...],
+) -> tuple[int, set[Player]]:
+    """将筛选条件拆分为职业/阵营掩码与指定玩家, 玩家不参与掩码缓存"""
+    players = {t for t in types if isinstance(t, Player)}
+    if not players:
+        return role_mask(*types), players  # pyright: ignore[reportArgumentType]
+    return role_mask(*(t for t in types if not isinstance(t, Player))), players
+
+
+class PlayerSet(frozenset[Player]):
+    """不可变的玩家集合, 排序、编号与展示文本在首次访问时计算并缓存
+
+    集合运算与筛选均返回新的集合
+    """
+
     __slots__ = ("__dict__",)  # for cached_property `sorted`
 
     @property
@@ -29,42 +46,70 @@ class PlayerSet(set[Player]):
         return self.from_(p for p in self if not p.alive)
 
     def killed(self) -> Self:
-        return self.from_(p for p in self if p.killed.is_set())
+        return self.from_(p for p in self if p.is_killed)
+
+    @functools.cached_property
+    def _filtered(self) -> dict[tuple[bool, tuple[object, ...]], Self]:
+        # 职业/阵营不会改变, 筛选结果可随集合一同缓存
+        return {}
 
     def include(self, *types: Player | Role | RoleGroup) -> Self:
-        return self.from_(
-            player
-            for player in self
-            if (player in types or player.role in types or player.role_group in types)
+        if (result := self._filtered.get((True, types))) is not None:
+            return result
+
+        mask, players = _compile_types(types)
+        result = self._filtered[(True, types)] = self.from_(
+            p for p in self if p.role_flags & mask or p in players
         )
+        return result
 
     def select(self, *types: Player | Role | RoleGroup) -> Self:
         return self.include(*types)
 
     def exclude(self, *types: Player | Role | RoleGroup) -> Self:
-        return self.from_(
-            player
-            for player in self
-            if (
-                player not in types
-                and player.role not in types
-                and player.role_group not in types
-            )
+        if (result := self._filtered.get((False, types))) is not None:
+            return result
+
+        mask, players = _compile_types(types)
+        result = self._filtered[(False, types)] = self.from_(
+            p for p in self if not p.role_flags & mask and p not in players
         )
+        return result
+
+    @functools.cached_property
+    def sorted(self) -> tuple[Player, ...]:
+        return tuple(sorted(self, key=lambda p: p.user_id))
+
+    @functools.cached_property
+    def _index(self) -> dict[Player, int]:
+        return {p: i for i, p in enumerate(self.sorted)}
 
-    def player_selected(self) -> Self:
-        return self.from_(p.selected for p in self.alive() if (p.selected is not None))
+    @functools.cached_property
+    def _shown(self) -> str:
+        return "\n".join(f"{i}. {p.name}" for i, p in enumerate(self.sorted, 1))
 
     @functools.cached_property
-    def sorted(self) -> list[Player]:
-        return sorted(self, key=lambda p: p.user_id)
+    def buttons(self) -> tuple[tuple[Button, ...], ...]:
+        """按 `sorted` 编号的玩家选择按钮, 每行 3 个"""
+        it = enumerate(self.sorted, 1)
+        rows: list[tuple[Button, ...]] = []
+        while line := tuple(itertools.islice(it, 3)):
+            rows.append(tuple(btn(p.name, str(i)) for i, p in line))
+        return tuple(rows)
 
     @property
     def shuffled(self) -> list[Player]:
-        players = self.sorted.copy()
+        players = list(self.sorted)
         random.shuffle(players)
         return players
 
+    def index(self, player: Player, /) -> int:
+        """玩家在 `sorted` 中的下标, 玩家不在集合中时抛出 `ValueError`"""
+        try:
+            return self._index[player]
+        except KeyError:
+            raise ValueError(f"{player!r} not in player set") from None
+
     async def vote(self) -> dict[Player, list[Player]]:
         players = self.alive()
         result: dict[Player, list[Player]] = {}
@@ -96,7 +141,7 @@ class PlayerSet(set[Player]):
                 tg.start_soon(send, p)
 
     def show(self) -> str:
-        return "\n".join(f"{i}. {p.name}" for i, p in enumerate(self.sorted, 1))
+        return self._shown
 
     def __getitem__(self, index: int, /) -> Player:
         return self.sorted[index]
@@ -109,3 +154,118 @@ class PlayerSet(set[Player]):
 
     def __sub__(self, other: AbstractSet[Player], /) -> Self:  # type: ignore[override]
         return self.from_(super().__sub__(other))
+
+
+class Roster:
+    """单局游戏的完整玩家名单
+
+    `members` 为不变的玩家集合; 名单另外维护存活/死亡/已击杀成员
+    及按职业、阵营划分的索引, 由 `Player.kill` 与 `Player.post_kill`
+    调用 `refresh` 增量更新
+
+    查询结果为 `PlayerSet` 快照, 在名单状态变化前缓存复用
+    """
+
+    members: PlayerSet
+    """名单中的所有玩家"""
+    version: int
+    """名单状态版本, 玩家存活/击杀状态变化时递增"""
+    counter: AliveCounter
+    """存活玩家按阵营分类的计数"""
+
+    def __init__(self, players: Iterable[Player] = (), /) -> None:
+        self.members = PlayerSet(players)
+        self.version = 0
+        self._alive = {p for p in self.members if p.alive}
+        self.counter = AliveCounter()
+        for p in self._alive:
+            self.counter.add(p.role, p.role_group)
+        self._killed = {p for p in self.members if p.is_killed}
+        self._buckets: dict[Role | RoleGroup, set[Player]] = {}
+        for p in self.members:
+            self._buckets.setdefault(p.role, set()).add(p)
+            self._buckets.setdefault(p.role_group, set()).add(p)
+        self._views: dict[object, PlayerSet] = {}
+
+    def __repr__(self) -> str:
+        return f"<Roster {self.members!r}>"
+
+    def __iter__(self) -> Iterator[Player]:
+        return iter(self.members)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def __contains__(self, player: object, /) -> bool:
+        return player in self.members
+
+    @property
+    def size(self) -> int:
+        return len(self.members)
+
+    @property
+    def sorted(self) -> tuple[Player, ...]:
+        return self.members.sorted
+
+    @property
+    def shuffled(self) -> list[Player]:
+        return self.members.shuffled
+
+    def refresh(self, player: Player) -> None:
+        """根据玩家当前状态更新索引"""
+        if player not in self.members:
+            return
+
+        changed = False
+        if player.alive != (player in self._alive):
+            if player.alive:
+                self._alive.add(player)
+                self.counter.add(player.role, player.role_group)
+            else:
+                self._alive.discard(player)
+                self.counter.add(player.role, player.role_group, -1)
+            changed = True
+
+        if player.is_killed and player not in self._killed:
+            self._killed.add(player)
+            changed = True
+
+        if changed:
+            self.version += 1
+            self._views.clear()
+
+    def _view(self, key: object, factory: Callable[[], Iterable[Player]]) -> PlayerSet:
+        if (view := self._views.get(key)) is None:
+            view = self._views[key] = PlayerSet(factory())
+        return view
+
+    def _matched(self, types: tuple[Player | Role | RoleGroup, ...]) -> set[Player]:
+        matched: set[Player] = set()
+        for t in types:
+            if isinstance(t, Player):
+                if t in self.members:
+                    matched.add(t)
+            elif bucket := self._buckets.get(t):
+                matched |= bucket
+        return matched
+
+    def alive(self) -> PlayerSet:
+        return self._view("alive", lambda: self._alive)
+
+    def dead(self) -> PlayerSet:
+        return self._view("dead", lambda: self.members.difference(self._alive))
+
+    def killed(self) -> PlayerSet:
+        return self._view("killed", lambda: self._killed)
+
+    def include(self, *types: Player | Role | RoleGroup) -> PlayerSet:
+        return self._view(("include", types), lambda: self._matched(types))
+
+    def select(self, *types: Player | Role | RoleGroup) -> PlayerSet:
+        return self.include(*types)
+
+    def exclude(self, *types: Player | Role | RoleGroup) -> PlayerSet:
+        return self._view(
+            ("exclude", types),
+            lambda: self.members.difference(self._matched(types)),
+        )
@@ -3,5 +3,7 @@ from ..player import Player
 
 
 class Civilian(Player):
+    __slots__ = ()
+
     role = Role.CIVILIAN
     role_group = RoleGroup.GOODGUY
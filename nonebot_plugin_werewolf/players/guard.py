@@ -25,6 +25,8 @@ class GuardInteractProvider(InteractProvider["Guard"]):
 
 
 class Guard(Player):
+    __slots__ = ()
+
     role = Role.GUARD
     role_group = RoleGroup.GOODGUY
     interact_provider = GuardInteractProvider
@@ -4,6 +4,8 @@ from .shooter import ShooterKillProvider
 
 
 class Hunter(Player):
+    __slots__ = ()
+
     role = Role.HUNTER
     role_group = RoleGroup.GOODGUY
     kill_provider = ShooterKillProvider
@@ -37,12 +37,18 @@ class IdiotNotifyProvider(NotifyProvider["Idiot"]):
 
 
 class Idiot(Player):
+    __slots__ = ("voted",)
+
     role = Role.IDIOT
     role_group = RoleGroup.GOODGUY
     kill_provider = IdiotKillProvider
     notify_provider = IdiotNotifyProvider
 
-    voted: bool = False
+    voted: bool
+
+    @override
+    def setup(self) -> None:
+        self.voted = False
 
     @override
     async def vote(self, players: "PlayerSet") -> Player | None:
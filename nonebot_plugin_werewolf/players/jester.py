@@ -23,6 +23,8 @@ class JesterNotifyProvider(NotifyProvider["Jester"]):
 
 
 class Jester(Player):
+    __slots__ = ()
+
     role = Role.JESTER
     role_group = RoleGroup.OTHERS
     kill_provider = JesterKillProvider
@@ -24,6 +24,8 @@ class ProphetInteractProvider(InteractProvider["Prophet"]):
 
 
 class Prophet(Player):
+    __slots__ = ()
+
     role = Role.PROPHET
     role_group = RoleGroup.GOODGUY
     interact_provider = ProphetInteractProvider
@@ -1,74 +1,143 @@
+import contextlib
+import math
 import secrets
+from collections import Counter
 from typing import TYPE_CHECKING
 from typing_extensions import override
 
 import anyio
-from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from nonebot.utils import escape_tag
 from nonebot_plugin_alconna import UniMessage
 
 from ..config import stop_command_prompt
 from ..constant import STOP_COMMAND
+from ..metrics import metrics
 from ..models import Role, RoleGroup
 from ..player import InteractProvider, NotifyProvider, Player
 from ..utils import as_player_set, check_index
 
 if TYPE_CHECKING:
+    from ..clock import Clock
     from ..player_set import PlayerSet
 
 
+CHAT_DRAIN_TIMEOUT = 5
+"""狼人回合结束时等待队友消息转发完成的最长时间 (秒)"""
+
+
+class WerewolfTeamChat:
+    """狼人阵营当晚共用的交流频道
+
+    所有狼人的消息进入同一队列, 由后台任务依次转发给其余队友;
+    各狼人的选择集中记录, 供 `finalize` 直接读取
+    """
+
+    members: "PlayerSet"
+    selections: dict[Player, Player]
+    failed: Counter[str]
+    """各玩家转发失败的消息数"""
+
+    def __init__(self, members: "PlayerSet") -> None:
+        self.members = members
+        self.selections = {}
+        self.failed = Counter()
+        self._send, self._receive = anyio.create_memory_object_stream[
+            tuple[Player, str | UniMessage]
+        ](math.inf)
+        self._scope = anyio.CancelScope()
+        self._done = anyio.Event()
+
+    def select(self, player: Player, target: Player) -> None:
+        self.selections[player] = target
+
+    def targets(self) -> "PlayerSet":
+        return as_player_set(*self.selections.values())
+
+    def post(self, sender: Player, message: str | UniMessage) -> None:
+        """将消息加入转发队列, 不等待发送完成"""
+        with contextlib.suppress(anyio.ClosedResourceError):
+            self._send.send_nowait((sender, message))
+
+    async def _deliver(self, player: Player, message: str | UniMessage) -> None:
+        try:
+            await player.send(message, skip_handler=True)
+        except Exception as exc:
+            self.failed[player.user_id] += 1
+            player.log(f"<r>狼人交流消息转发失败</r>: {escape_tag(repr(exc))}")
+
+    async def run(self) -> None:
+        """依次转发队列中的消息, 直至频道关闭"""
+        try:
+            with self._scope, self._receive:
+                async for sender, message in self._receive:
+                    async with anyio.create_task_group() as tg:
+                        for player in self.members.exclude(sender):
+                            tg.start_soon(self._deliver, player, message)
+        finally:
+            self._done.set()
+
+    async def close(self, clock: "Clock") -> None:
+        """停止接收消息, 限时等待已排队的消息转发完成"""
+        self._send.close()
+        with clock.move_on_after(CHAT_DRAIN_TIMEOUT):
+            await self._done.wait()
+        self._scope.cancel()
+
+
 class WerewolfInteractProvider(InteractProvider["Werewolf"]):
     @override
     async def before(self) -> None:
-        self.game.context.werewolf_start()
+        context = self.game.context
+        if context.werewolf_chat is None:
+            context.werewolf_chat = WerewolfTeamChat(
+                self.game.players.alive().select(RoleGroup.WEREWOLF)
+            )
+            self.game.start_soon(context.werewolf_chat.run)
+        context.werewolf_start()
+
+    @property
+    def chat(self) -> WerewolfTeamChat:
+        chat = self.game.context.werewolf_chat
+        assert chat is not None  # noqa: S101
+        return chat
 
-    async def handle_interact(
-        self,
-        players: "PlayerSet",
-        stream: MemoryObjectSendStream[str | UniMessage],
-    ) -> None:
-        self.selected = None
+    async def handle_interact(self, players: "PlayerSet") -> None:
+        chat = self.chat
 
         while True:
             input_msg = await self.p.receive()
             text = input_msg.extract_plain_text()
             index = check_index(text, len(players))
             if index is not None:
-                self.selected = players[index - 1]
-                msg = f"当前选择玩家: {self.selected.name}"
+                selected = players[index - 1]
+                chat.select(self.p, selected)
+                msg = f"当前选择玩家: {selected.name}"
                 await self.p.send(
                     f"🎯{msg}\n发送 “{stop_command_prompt}” 结束回合",
                     stop_btn_label="结束回合",
                     select_players=players,
                 )
-                await stream.send(f"📝队友 {self.p.name} {msg}")
+                chat.post(self.p, f"📝队友 {self.p.name} {msg}")
             if text == STOP_COMMAND:
-                if self.selected is not None:
+                if (selected := chat.selections.get(self.p)) is not None:
                     await self.p.send(
-                        f"✅你已结束当前回合\n🎯当前选择玩家: {self.selected.name}"
+                        f"✅你已结束当前回合\n🎯当前选择玩家: {selected.name}"
                     )
-                    await stream.send(f"📝队友 {self.p.name} 结束当前回合")
+                    chat.post(self.p, f"📝队友 {self.p.name} 结束当前回合")
                     return
                 await self.p.send(
                     "⚠️当前未选择玩家，无法结束回合",
                     select_players=players,
                 )
             else:
-                await stream.send(
-                    UniMessage.text(f"💬队友 {self.p.name}:\n") + input_msg
+                chat.post(
+                    self.p, UniMessage.text(f"💬队友 {self.p.name}:\n") + input_msg
                 )
 
-    async def handle_broadcast(
-        self,
-        partners: "PlayerSet",
-        stream: MemoryObjectReceiveStream[str | UniMessage],
-    ) -> None:
-        async for message in stream:
-            await partners.broadcast(message)
-
     @override
     async def interact(self) -> None:
         players = self.game.players.alive()
-        partners = players.select(RoleGroup.WEREWOLF).exclude(self.p)
+        partners = self.chat.members.exclude(self.p)
 
         msg = UniMessage()
         if partners:
@@ -85,16 +154,12 @@ class WerewolfInteractProvider(InteractProvider["Werewolf"]):
             .text("\n\n⚠️意见未统一将空刀"),
             select_players=players,
         )
-
-        send, recv = anyio.create_memory_object_stream[str | UniMessage](8)
-
-        async with anyio.create_task_group() as tg, recv:
-            tg.start_soon(self.handle_interact, players, send)
-            await self.handle_broadcast(partners, recv)
+        await self.handle_interact(players)
 
     async def finalize(self) -> None:
-        w = self.game.players.alive().select(RoleGroup.WEREWOLF)
-        match w.player_selected().shuffled:
+        chat = self.chat
+        w = chat.members
+        match chat.targets().shuffled:
             case []:
                 await w.broadcast("⚠️狼人未选择目标，此晚空刀")
             case [killed]:
@@ -115,10 +180,14 @@ class WerewolfInteractProvider(InteractProvider["Werewolf"]):
     @override
     async def after(self) -> None:
         if self.game.context.werewolf_end():
+            await self.chat.close(self.game.clock)
             await self.finalize()
 
         if not self.game.players.alive().select(Role.WITCH):
-            await anyio.sleep(5 + secrets.randbelow(15))
+            # 无女巫时随机等待, 避免通过回合时长推断女巫是否存活
+            delay = 5 + secrets.randbelow(15)
+            metrics.observe("werewolf.delay", delay)
+            await self.game.clock.sleep(delay)
 
 
 class WerewolfNotifyProvider(NotifyProvider["Werewolf"]):
@@ -137,6 +206,8 @@ class WerewolfNotifyProvider(NotifyProvider["Werewolf"]):
 
 
 class Werewolf(Player):
+    __slots__ = ()
+
     role = Role.WEREWOLF
     role_group = RoleGroup.WEREWOLF
     interact_provider = WerewolfInteractProvider
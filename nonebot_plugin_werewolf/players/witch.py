@@ -83,9 +83,16 @@ class WitchInteractProvider(InteractProvider["Witch"]):
 
 
 class Witch(Player):
+    __slots__ = ("antidote", "poison")
+
     role = Role.WITCH
     role_group = RoleGroup.GOODGUY
     interact_provider = WitchInteractProvider
 
-    antidote: bool = True
-    poison: bool = True
+    antidote: bool
+    poison: bool
+
+    @override
+    def setup(self) -> None:
+        self.antidote = True
+        self.poison = True
@@ -14,6 +14,8 @@ class WolfKingNotifyProvider(WerewolfNotifyProvider):
 
 
 class WolfKing(Werewolf):
+    __slots__ = ()
+
     role = Role.WOLFKING
     role_group = RoleGroup.WEREWOLF
     kill_provider = ShooterKillProvider
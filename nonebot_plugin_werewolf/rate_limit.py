@@ -0,0 +1,123 @@
+import heapq
+import itertools
+from enum import IntEnum
+
+import anyio
+
+from .config import TokenBucketConfig, config
+
+
+class Priority(IntEnum):
+    """发送优先级, 数值越小越优先"""
+
+    PROMPT = 0
+    """需要玩家响应的交互提示"""
+    NORMAL = 1
+    """一般消息"""
+    BROADCAST = 2
+    """转发/广播等信息性消息"""
+
+
+class TokenBucket:
+    rate: float
+    """每秒补充的令牌数"""
+    burst: int
+    """令牌桶容量"""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated: float | None = None
+
+    def consume(self, now: float) -> float:
+        """尝试取出一个令牌
+
+        返回值为 0 时取出成功, 否则为距离下一个令牌可用的时间 (秒)
+        """
+        if self._updated is not None:
+            elapsed = now - self._updated
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0
+        return (1 - self._tokens) / self.rate
+
+
+class _Waiter:
+    def __init__(self, priority: Priority, seq: int) -> None:
+        self.key = (priority, seq)
+        self._event = anyio.Event()
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return self.key < other.key
+
+    def wake(self) -> None:
+        self._event.set()
+
+    async def wait(self) -> None:
+        await self._event.wait()
+        self._event = anyio.Event()
+
+
+class RateLimiter:
+    """按优先级排队的令牌桶限流器"""
+
+    def __init__(self, bucket_config: TokenBucketConfig) -> None:
+        self.bucket = (
+            TokenBucket(bucket_config.rate, bucket_config.burst)
+            if bucket_config.rate > 0
+            else None
+        )
+        self._waiters: list[_Waiter] = []
+        self._seq = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, priority: Priority = Priority.NORMAL) -> None:
+        if self.bucket is None:
+            return
+        if not self._waiters and self.bucket.consume(anyio.current_time()) == 0:
+            return
+
+        waiter = _Waiter(priority, next(self._seq))
+        heapq.heappush(self._waiters, waiter)
+        try:
+            while True:
+                if self._waiters[0] is not waiter:
+                    await waiter.wait()
+                    continue
+                if (delay := self.bucket.consume(anyio.current_time())) == 0:
+                    return
+                # 等待令牌补充, 期间可能被更高优先级的请求取代队首位置
+                with anyio.move_on_after(delay):
+                    await waiter.wait()
+        finally:
+            self._waiters.remove(waiter)
+            heapq.heapify(self._waiters)
+            if self._waiters:
+                self._waiters[0].wake()
+
+
+class OutboundScheduler:
+    """单个机器人账号的消息发送调度器"""
+
+    def __init__(self) -> None:
+        self.group = RateLimiter(config.rate_limit.group)
+        self.private = RateLimiter(config.rate_limit.private)
+
+    async def acquire(self, *, private: bool, priority: Priority) -> None:
+        await (self.private if private else self.group).acquire(priority)
+
+
+_schedulers: dict[str, OutboundScheduler] = {}
+
+
+def get_scheduler(self_id: str) -> OutboundScheduler:
+    if (scheduler := _schedulers.get(self_id)) is None:
+        scheduler = _schedulers[self_id] = OutboundScheduler()
+    return scheduler
@@ -0,0 +1,224 @@
+import abc
+import dataclasses
+import random
+from collections.abc import Callable
+from typing import ClassVar
+from typing_extensions import override
+
+import anyio
+from nonebot_plugin_alconna import At, Button, Keyboard, Target, UniMessage
+
+from .clock import Clock, real_clock
+from .config import stop_command_prompt
+from .constant import STOP_COMMAND
+from .game import Game
+from .models import GameContext, Role, RoleGroup
+from .player import Player
+from .transport import MemoryTransport
+
+SIMULATION_SELF_ID = "simulation"
+
+
+@dataclasses.dataclass(slots=True)
+class Prompt:
+    """自动化玩家收到的消息"""
+
+    text: str
+    options: list[tuple[str, str]]
+    """可选择的玩家按钮: (玩家名称, 发送内容)"""
+    can_stop: bool
+    """是否带有结束按钮"""
+    group: bool
+    mentions: set[str]
+
+    @classmethod
+    def parse(cls, message: UniMessage, *, group: bool = False) -> "Prompt":
+        options: list[tuple[str, str]] = []
+        can_stop = False
+        for keyboard in message[Keyboard]:
+            for button in keyboard.children:
+                if not isinstance(button, Button) or button.text is None:
+                    continue
+                if button.text == stop_command_prompt:
+                    can_stop = True
+                elif button.label is not None:
+                    options.append((str(button.label), button.text))
+
+        return cls(
+            text=message.extract_plain_text(),
+            options=options,
+            can_stop=can_stop,
+            group=group,
+            mentions={seg.target for seg in message[At]},
+        )
+
+    @property
+    def expects_reply(self) -> bool:
+        return bool(self.options) or self.can_stop
+
+
+class Agent(abc.ABC):
+    """自动化玩家, 根据收到的消息决定回复内容"""
+
+    name: ClassVar[str]
+
+    def __init__(self, player: Player, rng: random.Random | None = None) -> None:
+        self.player = player
+        self.rng = rng or random.Random()  # noqa: S311
+
+    @abc.abstractmethod
+    def respond(self, prompt: Prompt) -> list[str]:
+        """返回需要依次发送的消息, 不需要回复时返回空列表"""
+
+
+class AbstainAgent(Agent):
+    """总是弃权: 能结束时立即结束, 否则不回复"""
+
+    name = "abstain"
+
+    @override
+    def respond(self, prompt: Prompt) -> list[str]:
+        return [STOP_COMMAND] if prompt.can_stop else []
+
+
+class RandomAgent(Agent):
+    """在所有可选项 (含结束) 中随机选择"""
+
+    name = "random"
+
+    def choose(self, prompt: Prompt) -> list[str]:
+        choices = [text for _, text in prompt.options]
+        if prompt.can_stop:
+            choices.append(STOP_COMMAND)
+        return [self.rng.choice(choices)] if choices else []
+
+    @override
+    def respond(self, prompt: Prompt) -> list[str]:
+        if prompt.group:
+            return [STOP_COMMAND] if prompt.can_stop else []
+        return self.choose(prompt)
+
+
+class SpammyAgent(RandomAgent):
+    """每次回复前附带若干无效消息"""
+
+    name = "spammy"
+    noise: ClassVar[tuple[str, ...]] = ("?", "0", "99", "spam", "哈哈哈")
+
+    @override
+    def respond(self, prompt: Prompt) -> list[str]:
+        if not prompt.expects_reply:
+            return []
+        spam = self.rng.choices(self.noise, k=self.rng.randint(1, 3))
+        return [*spam, *super().respond(prompt)]
+
+
+class HeuristicAgent(Agent):
+    """按职业做出简单合理的选择
+
+    狼人统一选择编号最小的好人, 女巫只用解药, 守卫不连续保护同一玩家
+    """
+
+    name = "heuristic"
+
+    def _resolve(self, prompt: Prompt) -> list[tuple[str, Player]]:
+        players = {p.name: p for p in self.player.game.players}
+        return [
+            (text, players[label]) for label, text in prompt.options if label in players
+        ]
+
+    @override
+    def respond(self, prompt: Prompt) -> list[str]:
+        if prompt.group or not prompt.options:
+            return [STOP_COMMAND] if prompt.can_stop else []
+
+        p = self.player
+        is_wolf = p.role_group == RoleGroup.WEREWOLF
+        night = p.game.context.state == GameContext.State.NIGHT
+        options = [(t, o) for t, o in self._resolve(prompt) if o is not p]
+
+        if is_wolf:
+            if night and prompt.can_stop:
+                # 已选择目标, 结束回合
+                return [STOP_COMMAND]
+            options = [(t, o) for t, o in options if o.role_group != RoleGroup.WEREWOLF]
+            return [options[0][0]] if options else [STOP_COMMAND]
+
+        if night and p.role == Role.WITCH:
+            # 解药提示仅有一个选项
+            return ["1"] if len(prompt.options) == 1 else [STOP_COMMAND]
+
+        if night and p.role == Role.GUARD:
+            options = [(t, o) for t, o in options if o is not p.selected]
+
+        if not options:
+            return [STOP_COMMAND] if prompt.can_stop else []
+        return [self.rng.choice(options)[0]]
+
+
+agents: dict[str, type[Agent]] = {
+    cls.name: cls for cls in (AbstainAgent, RandomAgent, SpammyAgent, HeuristicAgent)
+}
+
+
+async def simulate_game(
+    agent: Callable[[Player], Agent],
+    player_num: int,
+    *,
+    group_id: str,
+    clock: Clock = real_clock,
+    max_days: int = 20,
+    on_prompt: Callable[[Prompt], object] | None = None,
+    on_reply: Callable[[str], object] | None = None,
+) -> Game:
+    """由自动化玩家进行一局游戏, 返回结束后的游戏对象
+
+    超过 `max_days` 天仍未结束时中止游戏, 此时 `game.status` 为 None;
+    `on_prompt` 在每条需要玩家回复的消息发送时调用,
+    `on_reply` 在自动化玩家每次发送回复时调用
+    """
+    user_ids = {f"{group_id}:{i}" for i in range(player_num)}
+    group = Target(group_id, self_id=SIMULATION_SELF_ID)
+
+    game = None
+    async with anyio.create_task_group() as tg:
+        transport = MemoryTransport(record=False, task_group=tg, clock=clock)
+        game = await Game.new(group, user_ids, transport)
+        players = {p.user_id: agent(p) for p in game.players}
+        aborted = anyio.Event()
+
+        async def on_send(target: Target, message: UniMessage) -> None:
+            if game.context.day > max_days:
+                if not aborted.is_set():
+                    aborted.set()
+                    game.terminate()
+                return
+
+            prompt = Prompt.parse(message, group=not target.private)
+            if not prompt.expects_reply:
+                return
+            if on_prompt is not None:
+                on_prompt(prompt)
+
+            if target.private:
+                if (a := players.get(target.id)) is not None:
+                    for text in a.respond(prompt):
+                        reply(target.id, text)
+                return
+
+            for user_id, a in players.items():
+                if not prompt.mentions or user_id in prompt.mentions:
+                    for text in a.respond(prompt):
+                        reply(user_id, text, group_id)
+
+        def reply(user_id: str, text: str, group_id: str | None = None) -> None:
+            if on_reply is not None:
+                on_reply(text)
+            transport.put(user_id, text, group_id)
+
+        transport.on_send = on_send
+        await game.run()
+        tg.cancel_scope.cancel()
+
+    assert game is not None  # noqa: S101
+    return game
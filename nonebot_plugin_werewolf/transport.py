@@ -0,0 +1,247 @@
+import abc
+from collections.abc import Awaitable, Callable, Coroutine
+from typing import TYPE_CHECKING, Any, Literal
+from typing_extensions import override
+
+import nonebot
+from nonebot_plugin_alconna.uniseg import Receipt, Target, UniMessage
+from nonebot_plugin_uninfo import Interface, SceneType
+
+from .clock import Clock, real_clock
+from .utils import InputStore, SendHandler, add_stop_button, scene_cache
+
+if TYPE_CHECKING:
+    from anyio.abc import TaskGroup
+
+_Info = tuple[str | None, str | None]  # (name, avatar)
+
+
+class Sender(abc.ABC):
+    """向单个目标 (群聊或玩家私聊) 发送消息"""
+
+    calls: int = 0
+    """该发送器调用发送/修改消息接口的次数"""
+
+    @property
+    @abc.abstractmethod
+    def transport(self) -> "Transport":
+        """发送器所属的传输层"""
+
+    def _count_call(self) -> None:
+        self.calls += 1
+        self.transport.api_calls += 1
+
+    @abc.abstractmethod
+    async def send(
+        self,
+        msg: str | UniMessage,
+        stop_btn_label: str | None = None,
+        /,
+    ) -> Receipt | None:
+        """发送消息, 并修改上一条消息 (移除按钮)"""
+
+    @abc.abstractmethod
+    async def send_direct(self, msg: str | UniMessage) -> Receipt | None:
+        """直接发送消息, 不修改上一条消息, 也不记录为上一条消息"""
+
+
+class Transport(abc.ABC):
+    """游戏引擎的 I/O 端口
+
+    引擎仅通过该接口发送消息、接收玩家输入与查询成员信息, 不直接依赖 bot 与适配器
+    """
+
+    clock: Clock
+    """阶段限时与等待使用的时钟"""
+    inputs: InputStore
+    """玩家输入通道, 由事件响应器或模拟器写入"""
+    api_calls: int
+    """所有发送器调用发送/修改消息接口的总次数"""
+    task_group: "TaskGroup | None"
+    """游戏进行中的任务组, 由 `Game.run` 绑定"""
+
+    def __init__(self, clock: Clock = real_clock) -> None:
+        self.clock = clock
+        self.inputs = InputStore(clock)
+        self.api_calls = 0
+        self.task_group = None
+
+    @abc.abstractmethod
+    def sender(self, target: Target) -> Sender:
+        """创建向 `target` 发送消息的发送器"""
+
+    async def receive(self, user_id: str, group_id: str | None = None) -> UniMessage:
+        return await self.inputs.fetch(user_id, group_id)
+
+    @abc.abstractmethod
+    async def get_member(self, group_id: str, user_id: str) -> _Info | None:
+        """获取群成员的昵称与头像, 获取失败时返回 None"""
+
+    @abc.abstractmethod
+    async def get_scene(self, group_id: str) -> _Info:
+        """获取群聊的名称与头像"""
+
+    @abc.abstractmethod
+    def start_soon(
+        self, func: Callable[..., Coroutine[Any, Any, Any]], *args: object
+    ) -> None:
+        """在后台运行任务, 不阻塞调用者"""
+
+
+class NonebotSender(SendHandler[str | None], Sender):
+    def __init__(self, transport: Transport, target: Target) -> None:
+        super().__init__(target)
+        self._transport = transport
+        self.clock = transport.clock
+
+    @property
+    @override
+    def transport(self) -> Transport:
+        return self._transport
+
+    @override
+    def _background(self) -> "TaskGroup | None":
+        # 延迟修改随游戏结束一同完成, 不在 driver 的任务组中运行
+        return self.transport.task_group
+
+    @override
+    def _api_called(self, kind: Literal["send", "edit"], elapsed: float) -> None:
+        super()._api_called(kind, elapsed)
+        self._count_call()
+
+    def solve_msg(
+        self,
+        msg: UniMessage,
+        stop_btn_label: str | None = None,
+    ) -> UniMessage:
+        if stop_btn_label is not None:
+            msg = add_stop_button(msg, stop_btn_label)
+        return msg
+
+
+class NonebotTransport(Transport):
+    """通过 NoneBot 与适配器收发消息"""
+
+    def __init__(self, interface: Interface) -> None:
+        super().__init__()
+        self.interface = interface
+
+    @override
+    def sender(self, target: Target) -> NonebotSender:
+        return NonebotSender(self, target)
+
+    @override
+    async def get_member(self, group_id: str, user_id: str) -> _Info | None:
+        member = await self.interface.get_member(SceneType.GROUP, group_id, user_id)
+        if member is None:
+            member = await self.interface.get_member(SceneType.GUILD, group_id, user_id)
+        if member is None:
+            return None
+        return member.nick or member.user.nick or member.user.name, member.user.avatar
+
+    @override
+    async def get_scene(self, group_id: str) -> _Info:
+        return await scene_cache.fetch(self.interface, group_id)
+
+    @override
+    def start_soon(
+        self, func: Callable[..., Coroutine[Any, Any, Any]], *args: object
+    ) -> None:
+        nonebot.get_driver().task_group.start_soon(func, *args)
+
+
+class MemorySender(Sender):
+    def __init__(self, transport: "MemoryTransport", target: Target) -> None:
+        self._transport = transport
+        self.target = target
+
+    @property
+    @override
+    def transport(self) -> "MemoryTransport":
+        return self._transport
+
+    @override
+    async def send(
+        self,
+        msg: str | UniMessage,
+        stop_btn_label: str | None = None,
+        /,
+    ) -> None:
+        msg = UniMessage.text(msg) if isinstance(msg, str) else msg
+        if stop_btn_label is not None:
+            msg = add_stop_button(msg, stop_btn_label)
+        self._count_call()
+        await self.transport.deliver(self.target, msg)
+
+    @override
+    async def send_direct(self, msg: str | UniMessage) -> None:
+        msg = UniMessage.text(msg) if isinstance(msg, str) else msg
+        self._count_call()
+        await self.transport.deliver(self.target, msg)
+
+
+class MemoryTransport(Transport):
+    """在内存中收发消息, 不依赖 bot 与网络, 用于离线模拟对局与测试"""
+
+    members: dict[str, str]
+    """user_id -> 昵称"""
+    scene_name: str | None
+    sent: list[tuple[Target, UniMessage]] | None
+    """已发送的消息, 为 None 时不记录"""
+    on_send: Callable[[Target, UniMessage], Awaitable[object]] | None
+    """每条消息发送时调用, 可用于模拟玩家响应"""
+
+    def __init__(
+        self,
+        members: dict[str, str] | None = None,
+        *,
+        scene_name: str | None = None,
+        record: bool = True,
+        task_group: "TaskGroup | None" = None,
+        clock: Clock = real_clock,
+    ) -> None:
+        super().__init__(clock)
+        self.members = members or {}
+        self.scene_name = scene_name
+        self.sent = [] if record else None
+        self.on_send = None
+        self._task_group = task_group
+
+    async def deliver(self, target: Target, message: UniMessage) -> None:
+        if self.sent is not None:
+            self.sent.append((target, message))
+        if self.on_send is not None:
+            await self.on_send(target, message)
+
+    def put(
+        self,
+        user_id: str,
+        message: str | UniMessage,
+        group_id: str | None = None,
+    ) -> None:
+        """模拟玩家发送消息"""
+        if isinstance(message, str):
+            message = UniMessage.text(message)
+        self.inputs.put(message, user_id, group_id)
+
+    @override
+    def sender(self, target: Target) -> MemorySender:
+        return MemorySender(self, target)
+
+    @override
+    async def get_member(self, group_id: str, user_id: str) -> _Info | None:
+        if (nick := self.members.get(user_id)) is None:
+            return None
+        return nick, None
+
+    @override
+    async def get_scene(self, group_id: str) -> _Info:
+        return self.scene_name, None
+
+    @override
+    def start_soon(
+        self, func: Callable[..., Coroutine[Any, Any, Any]], *args: object
+    ) -> None:
+        if self._task_group is None:
+            raise RuntimeError("MemoryTransport 未绑定任务组, 无法运行后台任务")
+        self._task_group.start_soon(func, *args)
@@ -1,8 +1,8 @@
 import abc
 import functools
-import itertools
-from collections import defaultdict
-from collections.abc import Callable, Iterable
+import time
+from collections import Counter, OrderedDict, deque
+from collections.abc import Awaitable, Callable
 from typing import TYPE_CHECKING, Any, ClassVar, Generic, Literal, ParamSpec, TypeVar
 
 import anyio
@@ -16,12 +16,17 @@ from nonebot_plugin_alconna.uniseg import (
     Target,
     UniMessage,
 )
-from nonebot_plugin_uninfo import Session
+from nonebot_plugin_uninfo import Interface, SceneType, Session
 
+from .clock import Clock, real_clock
 from .config import GameBehavior, PresetData, config, stop_command_prompt
 from .constant import STOP_COMMAND
+from .metrics import metrics
+from .rate_limit import Priority, get_scheduler
 
 if TYPE_CHECKING:
+    from anyio.abc import TaskGroup
+
     from .player import Player
     from .player_set import PlayerSet
 
@@ -49,6 +54,141 @@ def extract_session_member_nick(session: Session) -> str | None:
     )
 
 
+_MemberKey = tuple[str, str, str]  # (self_id, group_id, user_id)
+
+
+class MemberCache:
+    """群成员昵称与头像的 LRU+TTL 缓存, 在多局游戏间共享"""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[_MemberKey, tuple[float, str, str | None]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(
+        self, self_id: str, group_id: str, user_id: str
+    ) -> tuple[str, str | None] | None:
+        """获取缓存的 (昵称, 头像), 未命中或已过期时返回 None"""
+        key = (self_id, group_id, user_id)
+        if (item := self._data.get(key)) is None:
+            return None
+
+        ts, nick, avatar = item
+        if time.monotonic() - ts > self.ttl:
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return nick, avatar
+
+    def set(
+        self,
+        self_id: str,
+        group_id: str,
+        user_id: str,
+        nick: str,
+        avatar: str | None = None,
+    ) -> None:
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+
+        key = (self_id, group_id, user_id)
+        # 部分来源不包含头像信息, 此时保留已缓存的头像
+        if avatar is None and (item := self._data.get(key)) is not None:
+            avatar = item[2]
+
+        self._data[key] = (time.monotonic(), nick, avatar)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def update_from_session(self, session: Session, group_id: str) -> None:
+        if nick := extract_session_member_nick(session):
+            avatar = (
+                session.member and session.member.user.avatar
+            ) or session.user.avatar
+            self.set(session.self_id, group_id, session.user.id, nick, avatar)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+member_cache = MemberCache(config.member_cache_size, config.member_cache_ttl)
+
+
+_SceneKey = tuple[str, str]  # (self_id, group_id)
+_SceneInfo = tuple[str | None, str | None]  # (name, avatar)
+
+
+class SceneCache:
+    """群聊名称与头像的 LRU+TTL 缓存, 同时记录各群聊可查询到的场景类型"""
+
+    scene_types: ClassVar[tuple[SceneType, ...]] = (SceneType.GROUP, SceneType.GUILD)
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[_SceneKey, tuple[float, _SceneInfo]] = OrderedDict()
+        self._types: OrderedDict[_SceneKey, SceneType] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _store(self, data: OrderedDict[_SceneKey, T], key: _SceneKey, value: T) -> None:
+        data[key] = value
+        data.move_to_end(key)
+        while len(data) > self.maxsize:
+            data.popitem(last=False)
+
+    def get(self, self_id: str, group_id: str) -> _SceneInfo | None:
+        key = (self_id, group_id)
+        if (item := self._data.get(key)) is None:
+            return None
+
+        ts, info = item
+        if time.monotonic() - ts > self.ttl:
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return info
+
+    async def fetch(self, interface: Interface, group_id: str) -> _SceneInfo:
+        self_id = interface.bot.self_id
+        if (info := self.get(self_id, group_id)) is not None:
+            return info
+
+        key = (self_id, group_id)
+        # 优先查询上次成功的场景类型, 跳过注定失败的请求
+        types = self.scene_types
+        if (preferred := self._types.get(key)) is not None:
+            types = (preferred, *(t for t in types if t != preferred))
+
+        scene = None
+        for scene_type in types:
+            if (scene := await interface.get_scene(scene_type, group_id)) is not None:
+                if self.maxsize > 0:
+                    self._store(self._types, key, scene_type)
+                break
+
+        info = (scene.name, scene.avatar) if scene is not None else (None, None)
+        if self.ttl > 0 and self.maxsize > 0:
+            self._store(self._data, key, (time.monotonic(), info))
+        return info
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._types.clear()
+
+
+scene_cache = SceneCache(config.scene_cache_size, config.scene_cache_ttl)
+
+
 class _InputTask:
     _event: anyio.Event
     _msg: UniMessage
@@ -65,45 +205,136 @@ class _InputTask:
         return self._msg
 
 
+_InputKey = tuple[str, str | None]  # (user_id, group_id)
+
+
 class InputStore:
-    locks: ClassVar[dict[str, anyio.Lock]] = defaultdict(anyio.Lock)
-    tasks: ClassVar[dict[str, _InputTask]] = {}
-
-    @staticmethod
-    def _key(user_id: str, group_id: str | None) -> str:
-        return f"{group_id}_{user_id}"
-
-    @classmethod
-    async def fetch(cls, user_id: str, group_id: str | None = None) -> UniMessage[Any]:
-        key = cls._key(user_id, group_id)
-        async with cls.locks[key]:
-            cls.tasks[key] = task = _InputTask()
-            try:
-                return await task.wait()
-            finally:
-                cls.tasks.pop(key, None)
-
-    @classmethod
-    async def fetch_until_stop(cls, user_id: str, group_id: str | None = None) -> None:
+    """单局游戏的玩家输入通道, 随游戏结束一同销毁
+
+    仅缓存私聊输入: 群聊消息多为讨论, 无人等待时直接丢弃,
+    避免在他人发言或投票期间发送的消息被当作自己回合的输入;
+    玩家开始新的交互或投票时调用 `discard` 丢弃此前积压的私聊消息
+    """
+
+    buffer_size: ClassVar[int] = 4
+    """每个私聊输入通道最多缓存的消息数, 为 0 时不缓存"""
+    buffer_ttl: ClassVar[float] = 10.0
+    """缓存消息的有效期 (秒), 过期消息在取出时丢弃"""
+    overflow: ClassVar[Literal["drop_oldest", "drop_newest"]] = "drop_oldest"
+    """缓存已满时丢弃最早的消息或新到达的消息"""
+
+    locks: dict[_InputKey, anyio.Lock]
+    tasks: dict[_InputKey, _InputTask]
+    buffers: dict[_InputKey, deque[tuple[float, UniMessage]]]
+    dropped: Counter[Literal["oldest", "newest", "expired", "stale"]]
+    """被丢弃的缓存消息计数"""
+    closed: bool
+    before_wait: Callable[[], Awaitable[object]] | None
+    """每次获取群聊输入前调用, 用于发送积压的群聊消息"""
+    clock: Clock
+    """缓存消息计时使用的时钟"""
+
+    def __init__(self, clock: Clock = real_clock) -> None:
+        self.clock = clock
+        self.locks = {}
+        self.tasks = {}
+        self.buffers = {}
+        self.dropped = Counter()
+        self.closed = False
+        self.before_wait = None
+
+    def _pop_buffered(self, key: _InputKey) -> UniMessage | None:
+        if (buffer := self.buffers.get(key)) is None:
+            return None
+
+        msg = None
+        expire = self.clock.now() - self.buffer_ttl
+        while buffer:
+            ts, item = buffer.popleft()
+            if ts >= expire:
+                msg = item
+                break
+            self.dropped["expired"] += 1
+
+        if not buffer:
+            del self.buffers[key]
+        return msg
+
+    async def fetch(self, user_id: str, group_id: str | None = None) -> UniMessage[Any]:
+        if group_id is not None and self.before_wait is not None:
+            await self.before_wait()
+
+        key = (user_id, group_id)
+        if (lock := self.locks.get(key)) is None:
+            # 无其他等待者时直接取出缓存消息, 无需创建锁
+            if (msg := self._pop_buffered(key)) is not None:
+                return msg
+            lock = self.locks[key] = anyio.Lock()
+
+        try:
+            async with lock:
+                if (msg := self._pop_buffered(key)) is not None:
+                    return msg
+
+                self.tasks[key] = task = _InputTask()
+                try:
+                    return await task.wait()
+                finally:
+                    self.tasks.pop(key, None)
+        finally:
+            # 没有其他等待者时回收锁, 避免长期运行时字典无限增长
+            if (
+                not lock.locked()
+                and not lock.statistics().tasks_waiting
+                and self.locks.get(key) is lock
+            ):
+                del self.locks[key]
+
+    async def fetch_until_stop(self, user_id: str, group_id: str | None = None) -> None:
         while True:
-            msg = await cls.fetch(user_id, group_id)
+            msg = await self.fetch(user_id, group_id)
             if msg.extract_plain_text().strip() == STOP_COMMAND:
                 return
 
-    @classmethod
-    def put(cls, msg: UniMessage, user_id: str, group_id: str | None = None) -> None:
-        key = cls._key(user_id, group_id)
-        if task := cls.tasks.pop(key, None):
+    def put(self, msg: UniMessage, user_id: str, group_id: str | None = None) -> None:
+        if self.closed:
+            return
+
+        key = (user_id, group_id)
+        if task := self.tasks.pop(key, None):
             task.set(msg)
+            return
+
+        if group_id is not None or self.buffer_size <= 0:
+            return
 
-    @classmethod
-    def cleanup(cls, players: Iterable[str], group_id: str) -> None:
-        for p, g in itertools.product(players, (group_id, None)):
-            key = cls._key(p, g)
-            if key in cls.locks:
-                del cls.locks[key]
-            if key in cls.tasks:
-                del cls.tasks[key]
+        buffer = self.buffers.setdefault(key, deque())
+        if len(buffer) >= self.buffer_size:
+            if self.overflow == "drop_newest":
+                self.dropped["newest"] += 1
+                return
+            buffer.popleft()
+            self.dropped["oldest"] += 1
+        buffer.append((self.clock.now(), msg))
+
+    def discard(self, user_id: str, group_id: str | None = None) -> None:
+        """丢弃积压的输入, 在玩家开始新的交互前调用"""
+        if (buffer := self.buffers.pop((user_id, group_id), None)) is not None:
+            self.dropped["stale"] += len(buffer)
+
+    def close(self) -> None:
+        self.closed = True
+        self.locks.clear()
+        self.tasks.clear()
+        self.buffers.clear()
+
+    def gauges(self) -> dict[str, int]:
+        return {
+            "locks": len(self.locks),
+            "tasks": len(self.tasks),
+            "buffers": len(self.buffers),
+            "buffered": sum(map(len, self.buffers.values())),
+        }
 
 
 @functools.cache
@@ -133,18 +364,25 @@ def add_players_button(msg: str | UniMessage, players: "PlayerSet") -> UniMessag
     if isinstance(msg, str):
         msg = UniMessage.text(msg)
 
-    it = enumerate(players, 1)
-    while line := tuple(itertools.islice(it, 3)):
-        msg.keyboard(*(btn(p.name, str(i)) for i, p in line))
+    for row in players.buttons:
+        msg.keyboard(*row)
     return msg
 
 
+DELAYED_EDIT_TIMEOUT = 10
+"""延迟修改消息的最长等待时间 (秒)"""
+
+
 class SendHandler(abc.ABC, Generic[P]):
     bot: Bot | None
     target: Event | Target | None
     reply_to: bool | None = None
     last_msg: UniMessage | None = None
     last_receipt: Receipt | None = None
+    clock: Clock = real_clock
+    """延迟修改消息时使用的时钟"""
+    edit_stats: Counter[Literal["performed", "skipped", "failed"]]
+    """该发送器修改上一条消息 (移除按钮) 的执行/跳过/失败次数"""
 
     def __init__(
         self,
@@ -153,6 +391,7 @@ class SendHandler(abc.ABC, Generic[P]):
     ) -> None:
         self.bot = bot
         self.target = target
+        self.edit_stats = Counter()
 
     def update(self, target: Event | Target, bot: Bot | None = None) -> None:
         self.bot = bot
@@ -171,20 +410,73 @@ class SendHandler(abc.ABC, Generic[P]):
         if self.bot is None and isinstance(self.target, Target):
             self.bot = await self.target.select()
 
-    async def _edit(self) -> None:
-        await self._fetch_bot()
+    async def _acquire(self, priority: Priority) -> None:
+        if self.bot is None:
+            return
 
-        last = self.last_receipt
-        if (
-            config.enable_button
-            and self.last_msg is not None
-            and last is not None
-            and last.editable
-            and not self._is_dc
-        ):
-            await last.edit(self.last_msg.exclude(Keyboard))
+        private = isinstance(self.target, Target) and self.target.private
+        scheduler = get_scheduler(self.bot.self_id)
+        await scheduler.acquire(private=private, priority=priority)
+
+    def _api_called(self, kind: Literal["send", "edit"], elapsed: float) -> None:
+        """每次调用发送/修改消息接口后调用"""
+        metrics.observe("api.duration", elapsed, kind)
+
+    def _take_last(self) -> tuple[UniMessage, Receipt] | None:
+        """取出上一条消息及其回执, 保证每条消息至多被修改一次"""
+        last_msg, last_receipt = self.last_msg, self.last_receipt
+        self.last_msg = self.last_receipt = None
+        if last_msg is None or last_receipt is None:
+            return None
+        return last_msg, last_receipt
 
-    async def _send(self, message: UniMessage) -> None:
+    async def _edit(self, last: tuple[UniMessage, Receipt] | None) -> None:
+        if last is None:
+            return
+
+        last_msg, receipt = last
+        # 仅在上一条消息带有按钮时修改, 移除按钮后内容不变则跳过
+        if not last_msg.has(Keyboard):
+            self.edit_stats["skipped"] += 1
+            return
+
+        await self._fetch_bot()
+        if not config.enable_button or not receipt.editable or self._is_dc:
+            self.edit_stats["skipped"] += 1
+            return
+
+        await self._acquire(Priority.BROADCAST)
+        start = time.perf_counter()
+        await receipt.edit(last_msg.exclude(Keyboard))
+        self._api_called("edit", time.perf_counter() - start)
+        self.edit_stats["performed"] += 1
+
+    def _background(self) -> "TaskGroup | None":
+        """运行延迟修改等后台任务的任务组, 为 None 时不在后台修改消息"""
+        return None
+
+    async def _delayed_edit(self, last: tuple[UniMessage, Receipt]) -> None:
+        """等待 `edit_delay` 秒后修改上一条消息, 任务被取消时立即修改"""
+        try:
+            await self.clock.sleep(config.edit_delay)
+        finally:
+            with (
+                anyio.CancelScope(shield=True),
+                self.clock.move_on_after(DELAYED_EDIT_TIMEOUT),
+            ):
+                try:
+                    await self._edit(last)
+                except Exception as exc:
+                    self.edit_stats["failed"] += 1
+                    nonebot.logger.warning(f"移除消息按钮失败: {exc!r}")
+
+    async def _send(
+        self,
+        message: UniMessage,
+        priority: Priority = Priority.NORMAL,
+        *,
+        record: bool = True,
+    ) -> Receipt:
         if self.target is None:
             raise RuntimeError("Target cannot be None when sending a message.")
 
@@ -193,14 +485,19 @@ class SendHandler(abc.ABC, Generic[P]):
             message = message.exclude(Keyboard)
 
         await self._fetch_bot()
+        await self._acquire(priority)
+        start = time.perf_counter()
         receipt = await message.send(
             target=self.target,
             bot=self.bot,
             reply_to=self.reply_to,
             fallback=FallbackStrategy.ignore,
         )
-        self.last_msg = message
-        self.last_receipt = receipt
+        self._api_called("send", time.perf_counter() - start)
+        if record:
+            self.last_msg = message
+            self.last_receipt = receipt
+        return receipt
 
     @abc.abstractmethod
     def solve_msg(
@@ -219,18 +516,34 @@ class SendHandler(abc.ABC, Generic[P]):
     ) -> Receipt:
         msg = UniMessage.text(msg) if isinstance(msg, str) else msg
         msg = self.solve_msg(msg, *args, **kwargs)
+        # 带有按钮的消息为需要玩家响应的交互提示, 优先发送
+        priority = Priority.PROMPT if msg.has(Keyboard) else Priority.NORMAL
+        last = self._take_last()
 
-        async with anyio.create_task_group() as tg:
-            tg.start_soon(self._edit)
-            tg.start_soon(self._send, msg)
+        if (
+            last is not None
+            and config.edit_delay > 0
+            and (task_group := self._background()) is not None
+        ):
+            task_group.start_soon(self._delayed_edit, last)
+            return await self._send(msg, priority)
 
-        if TYPE_CHECKING:
-            assert self.last_receipt is not None
+        receipt = None
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(self._edit, last)
+            receipt = await self._send(msg, priority)
+        assert receipt is not None  # noqa: S101
+        return receipt
 
-        return self.last_receipt
+    async def send_direct(self, msg: str | UniMessage) -> Receipt:
+        """直接发送消息, 不修改上一条消息, 也不记录为上一条消息"""
+        msg = UniMessage.text(msg) if isinstance(msg, str) else msg
+        return await self._send(msg, Priority.BROADCAST, record=False)
 
 
 class ConfigAccess:
+    __slots__ = ()
+
     @property
     def behavior(self) -> GameBehavior:
         return GameBehavior.get()
@@ -0,0 +1,46 @@
+from collections.abc import Callable
+
+from .models import AliveCounter, GameStatus
+
+VictoryRule = Callable[[AliveCounter], GameStatus | None]
+"""胜利条件, 返回 `None` 表示该条件未达成"""
+
+victory_rules: list[VictoryRule] = []
+"""按顺序检查的胜利条件表, 自定义模式可向其中添加条件"""
+
+
+def victory_rule(rule: VictoryRule, /) -> VictoryRule:
+    """注册胜利条件, 可用作装饰器"""
+    victory_rules.append(rule)
+    return rule
+
+
+def check_victory(counter: AliveCounter) -> GameStatus | None:
+    for rule in victory_rules:
+        if (status := rule(counter)) is not None:
+            return status
+    return None
+
+
+@victory_rule
+def _werewolf_majority(c: AliveCounter) -> GameStatus | None:
+    # 狼人数量大于其他职业数量
+    return GameStatus.WEREWOLF if c.werewolf >= c.non_werewolf else None
+
+
+@victory_rule
+def _civilians_eliminated(c: AliveCounter) -> GameStatus | None:
+    # 屠边-村民/中立全灭
+    return GameStatus.WEREWOLF if not c.civilian + c.others else None
+
+
+@victory_rule
+def _gods_eliminated(c: AliveCounter) -> GameStatus | None:
+    # 屠边-神职全灭
+    return GameStatus.WEREWOLF if not c.god else None
+
+
+@victory_rule
+def _werewolves_eliminated(c: AliveCounter) -> GameStatus | None:
+    # 狼人全灭
+    return GameStatus.GOODGUY if not c.werewolf else None
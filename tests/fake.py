@@ -1,7 +1,7 @@
 # ruff: noqa: N806, ANN401
 import contextlib
 import itertools
-from collections.abc import Callable, Generator
+from collections.abc import Callable, Generator, Sequence
 from types import TracebackType
 from typing import TYPE_CHECKING, Any, Literal, overload
 from typing_extensions import Self
@@ -21,11 +21,59 @@ from nonebug.mixin.dependent import DependentContext
 from nonebug.mixin.process import MatcherContext
 from pydantic import Field, create_model
 
+if TYPE_CHECKING:
+    from nonebot_plugin_werewolf.game import Game
+    from nonebot_plugin_werewolf.models import Role
+    from nonebot_plugin_werewolf.transport import Transport
+
 fake_user_id = (lambda: (g := itertools.count(100000)) and (lambda: next(g)))()
 fake_group_id = (lambda: (g := itertools.count(200000)) and (lambda: next(g)))()
 fake_message_id = (lambda: (g := itertools.count(1)) and (lambda: next(g)))()
 
 
+def fake_game(
+    *roles: "Role",
+    user_ids: Sequence[str] | None = None,
+    group_id: str = "10001",
+    self_id: str = "bot",
+    adapter: str | None = None,
+    transport: "Transport | None" = None,
+) -> "Game":
+    """构造一局未启动的游戏
+
+    玩家编号默认为 `0..n-1`, 名称与编号相同; 未指定 `roles` 时所有玩家均为平民
+    """
+    from nonebot_plugin_alconna import Target
+
+    from nonebot_plugin_werewolf.game import Game
+    from nonebot_plugin_werewolf.models import Role
+    from nonebot_plugin_werewolf.player import Player
+    from nonebot_plugin_werewolf.player_set import Roster
+    from nonebot_plugin_werewolf.transport import MemoryTransport
+    from nonebot_plugin_werewolf.utils import logger_wrapper
+
+    if user_ids is None:
+        user_ids = [str(idx) for idx in range(len(roles))]
+    if not roles:
+        roles = (Role.CIVILIAN,) * len(user_ids)
+
+    game = Game(
+        Target(group_id, self_id=self_id, adapter=adapter),
+        transport or MemoryTransport(),
+    )
+    game.log = logger_wrapper(group_id)
+    players: list[Player] = []
+    for user_id, role in zip(user_ids, roles, strict=True):
+        cls = Player._player_class[role]  # noqa: SLF001
+        player = cls(
+            game, Target(user_id, private=True, self_id=self_id, adapter=adapter)
+        )
+        player.name = player.colored_name = user_id
+        players.append(player)
+    game.players = Roster(players)
+    return game
+
+
 @contextlib.contextmanager
 def ensure_context(
     bot: Bot,
@@ -0,0 +1,70 @@
+# ruff: noqa: S101
+
+import pytest
+
+from .fake import fake_game
+
+
+@pytest.mark.usefixtures("app")
+async def test_virtual_clock_advance() -> None:
+    import anyio
+
+    from nonebot_plugin_werewolf.clock import VirtualClock
+
+    clock = VirtualClock()
+    woke: list[tuple[str, float]] = []
+
+    async def sleeper(name: str, delay: float) -> None:
+        await clock.sleep(delay)
+        woke.append((name, clock.now()))
+
+    async def waiter() -> None:
+        with clock.move_on_after(5) as scope:
+            await anyio.sleep_forever()
+        assert scope.cancelled_caught
+        woke.append(("timeout", clock.now()))
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(sleeper, "b", 20)
+        tg.start_soon(sleeper, "a", 10)
+        tg.start_soon(waiter)
+        await anyio.wait_all_tasks_blocked()
+
+        for _ in range(3):
+            clock.advance(4)
+            await anyio.wait_all_tasks_blocked()
+        # 被唤醒的任务在时间推进后才继续运行
+        assert woke == [("timeout", 8), ("a", 12)]
+
+        clock.advance(8)
+
+    assert woke[-1] == ("b", 20)
+
+
+@pytest.mark.usefixtures("app")
+async def test_virtual_clock_autojump() -> None:
+    import time
+
+    import anyio
+
+    from nonebot_plugin_werewolf.clock import VirtualClock
+    from nonebot_plugin_werewolf.models import Role
+    from nonebot_plugin_werewolf.transport import MemoryTransport
+
+    clock = VirtualClock()
+    start = time.perf_counter()
+    async with anyio.create_task_group() as tg:
+        game = fake_game(
+            Role.WEREWOLF,
+            Role.CIVILIAN,
+            transport=MemoryTransport(task_group=tg, clock=clock),
+        )
+        wolf = game.players.sorted[0]
+        tg.start_soon(clock.run)
+        # 狼人交互超时, 且无女巫时额外等待 5~20 秒
+        await wolf.interact()
+        tg.cancel_scope.cancel()
+
+    timeout = wolf.interact_timeout
+    assert timeout + 5 <= clock.now() < timeout + 20
+    assert time.perf_counter() - start < 5
@@ -0,0 +1,82 @@
+# ruff: noqa: S101
+
+import pytest
+
+from .fake import fake_game
+
+
+@pytest.mark.usefixtures("app")
+async def test_dead_channel_rate_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    import anyio
+    from pydantic import ValidationError
+
+    from nonebot_plugin_werewolf.clock import VirtualClock
+    from nonebot_plugin_werewolf.config import GameBehavior
+    from nonebot_plugin_werewolf.dead_channel import DeadChannel
+    from nonebot_plugin_werewolf.player_set import PlayerSet
+
+    behavior = GameBehavior.get()
+    monkeypatch.setattr(behavior, "dead_channel_rate_limit", 6)
+    monkeypatch.setattr(behavior, "dead_channel_burst", 2)
+
+    clock = VirtualClock()
+    channel = DeadChannel(PlayerSet(), anyio.Event(), clock)
+
+    assert channel._allow("1")  # noqa: SLF001
+    assert channel._allow("1")  # noqa: SLF001
+    assert not channel._allow("1")  # noqa: SLF001
+    assert channel._allow("2")  # noqa: SLF001
+
+    # 每 10 秒恢复一次发言机会
+    clock.advance(10)
+    assert channel._allow("1")  # noqa: SLF001
+    assert not channel._allow("1")  # noqa: SLF001
+
+    monkeypatch.setattr(behavior, "dead_channel_rate_limit", 0)
+    clock.advance(90)
+    assert not channel._allow("1")  # noqa: SLF001
+
+    with pytest.raises(ValidationError):
+        GameBehavior(dead_channel_burst=0)
+
+
+@pytest.mark.usefixtures("app")
+async def test_dead_channel_broadcast(monkeypatch: pytest.MonkeyPatch) -> None:
+    import anyio
+    from nonebot_plugin_alconna import UniMessage
+
+    from nonebot_plugin_werewolf.dead_channel import DeadChannel
+    from nonebot_plugin_werewolf.models import Role
+    from nonebot_plugin_werewolf.player import Player
+
+    sent: list[tuple[str, str]] = []
+
+    async def send(self: Player, message: str | UniMessage, **_: object) -> None:
+        text = message if isinstance(message, str) else message.extract_plain_text()
+        if self.user_id == "2" and text.startswith("玩家"):
+            raise RuntimeError("send failed")
+        sent.append((self.user_id, text))
+
+    monkeypatch.setattr(Player, "send", send)
+
+    game = fake_game(*[Role.CIVILIAN] * 4)
+    p0, p1, p2, p3 = game.players.sorted
+    finished = anyio.Event()
+    channel = DeadChannel(game.players, finished)
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(channel.run)
+        for player in (p0, p1, p2):
+            player.killed.set()
+            await anyio.wait_all_tasks_blocked()
+
+        assert channel.members == [p0, p1, p2]
+        sent.clear()
+
+        game.inputs.put(UniMessage.text("hi"), p0.user_id)
+        await anyio.wait_all_tasks_blocked()
+        finished.set()
+
+    assert sorted(sent) == [("1", "玩家 0:\nhi")]
+    assert channel.failed == {"2": 1}
+    assert p3 not in channel.members
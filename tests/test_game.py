@@ -0,0 +1,110 @@
+# ruff: noqa: S101
+
+from typing import TYPE_CHECKING, cast
+
+import pytest
+
+if TYPE_CHECKING:
+    from nonebot_plugin_uninfo import Interface
+
+
+class FakeInterface:
+    def __init__(self) -> None:
+        self.running = 0
+        self.max_running = 0
+        self.calls = 0
+
+    async def get_member(self, *_: object) -> None:
+        import anyio
+
+        self.calls += 1
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await anyio.sleep(0.01)
+        self.running -= 1
+
+    async def get_scene(self, *_: object) -> None:
+        return None
+
+
+@pytest.mark.usefixtures("app")
+async def test_init_players_concurrent() -> None:
+    from collections import Counter
+
+    from nonebot_plugin_alconna import Target
+
+    from nonebot_plugin_werewolf.game import (
+        INIT_PLAYERS_CONCURRENCY,
+        Game,
+        init_players,
+    )
+    from nonebot_plugin_werewolf.models import RoleGroup
+    from nonebot_plugin_werewolf.transport import NonebotTransport
+    from nonebot_plugin_werewolf.utils import logger_wrapper
+
+    interface = FakeInterface()
+    transport = NonebotTransport(cast("Interface", interface))
+    game = Game(Target("10001", self_id="bot"), transport)
+    game.log = logger_wrapper("test")
+    user_ids = {str(i) for i in range(100, 112)}
+
+    players = await init_players(game, user_ids)
+
+    assert {p.user_id for p in players} == user_ids
+    assert {p.name for p in players} == user_ids
+    assert 1 < interface.max_running <= INIT_PLAYERS_CONCURRENCY
+    # 未获取到群成员信息时, 依次尝试 GROUP 与 GUILD
+    assert interface.calls == 2 * len(user_ids)
+
+    w, p, c = game.preset.role_preset[len(user_ids)]
+    groups = Counter(player.role_group for player in players)
+    assert groups[RoleGroup.WEREWOLF] == w
+    assert groups[RoleGroup.GOODGUY] + groups[RoleGroup.OTHERS] == p + c
+
+
+@pytest.mark.usefixtures("app")
+async def test_init_players_member_cache() -> None:
+    from nonebot_plugin_alconna import Target
+
+    from nonebot_plugin_werewolf.game import Game, init_players
+    from nonebot_plugin_werewolf.transport import NonebotTransport
+    from nonebot_plugin_werewolf.utils import logger_wrapper, member_cache
+
+    interface = FakeInterface()
+    transport = NonebotTransport(cast("Interface", interface))
+    game = Game(Target("10001", self_id="bot"), transport)
+    game.log = logger_wrapper("test")
+    user_ids = {str(i) for i in range(100, 106)}
+    for user_id in user_ids:
+        member_cache.set("bot", "10001", user_id, f"name{user_id}")
+
+    try:
+        players = await init_players(game, user_ids)
+    finally:
+        member_cache.clear()
+
+    assert interface.calls == 0
+    assert {p.name for p in players} == {f"name{u}" for u in user_ids}
+
+
+@pytest.mark.usefixtures("app")
+async def test_init_players_without_self_id() -> None:
+    from nonebot_plugin_alconna import Target
+
+    from nonebot_plugin_werewolf.game import Game, init_players
+    from nonebot_plugin_werewolf.transport import MemoryTransport
+    from nonebot_plugin_werewolf.utils import logger_wrapper, member_cache
+
+    user_ids = {str(i) for i in range(100, 106)}
+    transport = MemoryTransport({u: f"name{u}" for u in user_ids})
+    game = Game(Target("10001"), transport)
+    game.log = logger_wrapper("test")
+
+    # 无法确定 bot 时不读写成员缓存
+    try:
+        players = await init_players(game, user_ids)
+        assert len(member_cache) == 0
+    finally:
+        member_cache.clear()
+
+    assert {p.name for p in players} == {f"name{u}" for u in user_ids}
@@ -0,0 +1,117 @@
+# ruff: noqa: S101
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from nonebot_plugin_alconna import UniMessage
+
+    from nonebot_plugin_werewolf.game import GameMessenger
+
+
+def fake_messenger(
+    monkeypatch: pytest.MonkeyPatch,
+    *,
+    coalesce: bool = True,
+) -> tuple["GameMessenger", list[tuple[str, str | None]]]:
+    from nonebot_plugin_alconna import Target
+
+    from nonebot_plugin_werewolf.config import config
+    from nonebot_plugin_werewolf.game import GameMessenger
+    from nonebot_plugin_werewolf.player_set import PlayerSet
+    from nonebot_plugin_werewolf.transport import MemoryTransport
+    from nonebot_plugin_werewolf.utils import logger_wrapper
+
+    monkeypatch.setattr(config, "enable_coalesce", coalesce)
+    messenger = GameMessenger(
+        Target("10001", self_id="bot"),
+        PlayerSet(),
+        MemoryTransport(),
+        logger_wrapper("test"),
+    )
+
+    sent: list[tuple[str, str | None]] = []
+
+    async def send(msg: "UniMessage", stop_btn_label: str | None = None) -> None:
+        sent.append((msg.extract_plain_text(), stop_btn_label))
+
+    monkeypatch.setattr(messenger._send_handler, "send", send)  # noqa: SLF001
+    return messenger, sent
+
+
+@pytest.mark.usefixtures("app")
+async def test_messenger_without_coalesce(monkeypatch: pytest.MonkeyPatch) -> None:
+    messenger, sent = fake_messenger(monkeypatch, coalesce=False)
+
+    await messenger.send("a")
+    await messenger.send("b")
+    assert sent == [("a", None), ("b", None)]
+
+
+@pytest.mark.usefixtures("app")
+async def test_messenger_coalesce(monkeypatch: pytest.MonkeyPatch) -> None:
+    messenger, sent = fake_messenger(monkeypatch)
+
+    await messenger.send("a")
+    await messenger.send("b")
+    assert sent == []
+    await messenger.flush()
+    assert sent == [("a\n\nb", None)]
+
+    await messenger.send("c")
+    await messenger.send("d", stop_btn_label="stop")
+    assert sent[1:] == [("c\n\nd", "stop")]
+
+    await messenger.flush()
+    assert len(sent) == 2
+
+
+@pytest.mark.usefixtures("app")
+async def test_messenger_flush_before_input(monkeypatch: pytest.MonkeyPatch) -> None:
+    import anyio
+    from nonebot_plugin_alconna import UniMessage
+
+    messenger, sent = fake_messenger(monkeypatch)
+
+    await messenger.send("a")
+    # 私聊输入 (如死者频道、狼人交流) 不触发群聊消息发送
+    messenger.inputs.put(UniMessage.text("1"), "user")
+    await messenger.inputs.fetch("user")
+    assert sent == []
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(messenger.inputs.fetch, "user", "10001")
+        await anyio.wait_all_tasks_blocked()
+        assert sent == [("a", None)]
+        messenger.inputs.put(UniMessage.text("1"), "user", "10001")
+
+
+@pytest.mark.usefixtures("app")
+async def test_messenger_flush_on_finish(monkeypatch: pytest.MonkeyPatch) -> None:
+    import anyio
+
+    messenger, sent = fake_messenger(monkeypatch)
+    finished = anyio.Event()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(messenger.run, finished)
+        await messenger.send("a")
+        finished.set()
+
+    assert sent == [("a", None)]
+
+
+@pytest.mark.usefixtures("app")
+async def test_messenger_flush_on_cancel(monkeypatch: pytest.MonkeyPatch) -> None:
+    import anyio
+
+    messenger, sent = fake_messenger(monkeypatch)
+
+    # 游戏被中止时, 积压的消息仍会发送
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(messenger.run, anyio.Event())
+        await messenger.send("a")
+        tg.cancel_scope.cancel()
+
+    assert sent == [("a", None)]
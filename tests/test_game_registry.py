@@ -0,0 +1,74 @@
+# ruff: noqa: S101
+
+import pytest
+
+from .fake import fake_game
+
+
+@pytest.mark.usefixtures("app")
+async def test_game_registry_index() -> None:
+    from nonebot_plugin_alconna import Target
+
+    from nonebot_plugin_werewolf.game import GameRegistry
+
+    registry = GameRegistry()
+    game1 = fake_game(user_ids=["1", "2", "3"], group_id="10001")
+    game2 = fake_game(user_ids=["3", "4"], group_id="10002")
+
+    async with registry.register(game1), registry.register(game2):
+        assert registry.has_running_games()
+        assert registry.get(Target("10001", self_id="bot")) is game1
+        assert registry.get(Target("10002", self_id="bot")) is game2
+        assert registry.get(Target("10001", self_id="other")) is None
+        assert registry.get(Target("10001", private=True, self_id="bot")) is None
+        assert Target("10002", self_id="bot") in registry
+
+        assert registry.is_user_in_game("bot", "1", "10001")
+        assert not registry.is_user_in_game("bot", "1", "10002")
+        assert registry.is_user_in_game("bot", "3", "10002")
+        assert registry.is_user_in_game("bot", "4", None)
+        assert not registry.is_user_in_game("other", "4", None)
+        assert not registry.is_user_in_game("bot", "5", None)
+        assert registry.has_player("bot", "2")
+        assert not registry.has_player("other", "2")
+
+        async with registry.register(game1):
+            pass  # 重复注销不应影响其他游戏的索引
+
+        assert registry.is_user_in_game("bot", "3", None)
+        assert not registry.is_user_in_game("bot", "1", None)
+        assert registry.get(Target("10002", self_id="bot")) is game2
+
+    assert not registry.has_running_games()
+    assert not registry.is_user_in_game("bot", "3", None)
+
+
+@pytest.mark.usefixtures("app")
+async def test_game_registry_put_input() -> None:
+    import anyio
+    from nonebot_plugin_alconna import UniMessage
+
+    from nonebot_plugin_werewolf.game import GameRegistry
+
+    registry = GameRegistry()
+    game1 = fake_game(user_ids=["1", "2"], group_id="10001")
+    game2 = fake_game(user_ids=["2", "3"], group_id="10002")
+
+    async with registry.register(game1), registry.register(game2):
+        async with anyio.create_task_group() as tg:
+
+            async def fetch_group() -> None:
+                msg = await game1.inputs.fetch("1", "10001")
+                assert msg.extract_plain_text() == "group"
+
+            tg.start_soon(fetch_group)
+            await anyio.wait_all_tasks_blocked()
+            registry.put_input("bot", UniMessage.text("group"), "1", "10001")
+
+        registry.put_input("bot", UniMessage.text("private"), "2")
+        registry.put_input("bot", UniMessage.text("ignored"), "4")
+        registry.put_input("other", UniMessage.text("ignored"), "1", "10001")
+
+        assert (await game1.inputs.fetch("2")).extract_plain_text() == "private"
+        assert (await game2.inputs.fetch("2")).extract_plain_text() == "private"
+        assert registry.input_gauges()["buffered"] == 0
@@ -0,0 +1,53 @@
+# ruff: noqa: S101
+
+import pytest
+
+
+@pytest.mark.usefixtures("app")
+def test_histogram() -> None:
+    from nonebot_plugin_werewolf.metrics import COUNT_BUCKETS, Histogram
+
+    hist = Histogram(COUNT_BUCKETS)
+    for value in (0, 1, 1, 3, 7, 1000):
+        hist.observe(value)
+
+    assert hist.count == 6
+    assert hist.buckets[0] == 1
+    assert hist.buckets[-1] == 1
+    assert hist.quantile(0.5) == 1
+    assert hist.quantile(0.8) == 10
+    assert hist.quantile(1) == 1000
+    assert hist.mean == pytest.approx(1012 / 6)
+
+
+@pytest.mark.usefixtures("app")
+async def test_game_metrics(monkeypatch: pytest.MonkeyPatch) -> None:
+    import anyio
+
+    from nonebot_plugin_werewolf import metrics as metrics_module
+    from nonebot_plugin_werewolf.clock import VirtualClock
+    from nonebot_plugin_werewolf.metrics import MetricsRegistry
+    from nonebot_plugin_werewolf.simulation import HeuristicAgent, simulate_game
+
+    registry = MetricsRegistry()
+    for module in ("game", "player", "players.werewolf"):
+        monkeypatch.setattr(
+            f"nonebot_plugin_werewolf.{module}.metrics", registry, raising=True
+        )
+    assert metrics_module.metrics is not registry
+
+    clock = VirtualClock()
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(clock.run)
+        game = await simulate_game(HeuristicAgent, 9, group_id="metrics", clock=clock)
+        tg.cancel_scope.cancel()
+
+    snapshot = registry.snapshot()
+    phases = snapshot["phase.duration"]
+    assert {"notify", "night", "day", "finish"} <= phases.keys()
+    assert phases["night"]["count"] == game.context.day
+    assert sum(h["sum"] for h in snapshot["phase.api_calls"].values()) == (
+        game.transport.api_calls
+    )
+    assert "WEREWOLF" in snapshot["interact.duration"]
+    assert snapshot["interact.api_calls"]["WEREWOLF"]["sum"] > 0
@@ -0,0 +1,159 @@
+# ruff: noqa: S101
+
+import pytest
+
+from .fake import fake_game
+
+
+@pytest.mark.usefixtures("app")
+async def test_roster_index() -> None:
+    from nonebot_plugin_werewolf.models import KillReason, Role, RoleGroup
+    from nonebot_plugin_werewolf.player_set import PlayerSet
+
+    game = fake_game(Role.WEREWOLF, Role.WOLFKING, Role.WITCH, Role.CIVILIAN)
+    roster = game.players
+    wolf, king, witch, civilian = roster.sorted
+
+    assert roster.alive() == roster.members
+    assert roster.alive() is roster.alive()
+    assert roster.select(RoleGroup.WEREWOLF) == {wolf, king}
+    assert roster.select(Role.WITCH, civilian) == {witch, civilian}
+    assert roster.exclude(RoleGroup.WEREWOLF, witch) == {civilian}
+    assert type(roster.alive()) is PlayerSet
+
+    alive = roster.alive()
+    version = roster.version
+    await wolf.kill(KillReason.VOTE)
+    assert roster.version == version + 1
+    assert roster.alive() == {king, witch, civilian}
+    assert roster.dead() == {wolf}
+    assert not roster.killed()
+    # 旧的查询结果保持为快照, 不受名单更新影响
+    assert alive == roster.members
+    assert alive.dead() == {wolf}
+
+    await wolf.post_kill()
+    assert roster.killed() == {wolf}
+    assert roster.killed().exclude(wolf) == set()
+
+    # 重复击杀不会改变名单版本
+    version = roster.version
+    await wolf.kill(KillReason.VOTE)
+    assert roster.version == version
+
+    # 名单不是集合, 玩家状态不影响成员集合本身
+    assert len(roster) == 4
+    assert wolf in roster
+    assert roster.members == {wolf, king, witch, civilian}
+    assert not isinstance(roster, frozenset)
+
+
+@pytest.mark.usefixtures("app")
+def test_role_flags() -> None:
+    from nonebot_plugin_werewolf.models import Role, RoleGroup, role_mask
+    from nonebot_plugin_werewolf.player_set import PlayerSet
+
+    flags = [t.flag for t in (*Role, *RoleGroup)]
+    assert len(set(flags)) == len(flags)
+    assert all(flag.bit_count() == 1 for flag in flags)
+    assert role_mask(Role.WITCH, RoleGroup.WEREWOLF) == (
+        Role.WITCH.flag | RoleGroup.WEREWOLF.flag
+    )
+
+    game = fake_game(Role.WEREWOLF, Role.WITCH, Role.JESTER, Role.CIVILIAN)
+    players = PlayerSet(game.players)
+    wolf, witch, jester, civilian = players.sorted
+
+    assert players.select(RoleGroup.WEREWOLF) == {wolf}
+    assert players.select(Role.CIVILIAN, RoleGroup.OTHERS) == {jester, civilian}
+    assert players.select(RoleGroup.WEREWOLF, witch) == {wolf, witch}
+    assert players.exclude(Role.CIVILIAN, RoleGroup.OTHERS) == {wolf, witch}
+    assert players.exclude(RoleGroup.GOODGUY, jester) == {wolf}
+    assert players.exclude() == players
+    assert not players.include()
+
+
+@pytest.mark.usefixtures("app")
+def test_player_set_frozen() -> None:
+    from nonebot_plugin_alconna import Button, Keyboard
+
+    from nonebot_plugin_werewolf.models import Role
+    from nonebot_plugin_werewolf.player_set import PlayerSet
+    from nonebot_plugin_werewolf.utils import add_players_button
+
+    game = fake_game(*[Role.CIVILIAN] * 5)
+    players = PlayerSet(reversed(game.players.sorted))
+    first, *_, last = players.sorted
+
+    assert [p.user_id for p in players.sorted] == ["0", "1", "2", "3", "4"]
+    assert players[0] is first
+    assert players.index(last) == 4
+    assert players.show().splitlines()[0] == "1. 0"
+    assert hash(players) == hash(frozenset(players))
+    assert not hasattr(players, "add")
+
+    fewer = players - {first}
+    assert type(fewer) is PlayerSet
+    assert fewer[0] is not first
+    assert fewer.show().splitlines()[0] == "1. 1"
+    with pytest.raises(ValueError, match="not in player set"):
+        fewer.index(first)
+
+    # 按钮编号与 `players[index - 1]` 一致
+    msg = add_players_button("", fewer)
+    buttons = [b for kb in msg[Keyboard] for b in kb.children if isinstance(b, Button)]
+    assert [(b.label, b.text) for b in buttons] == [
+        (p.name, str(i)) for i, p in enumerate(fewer.sorted, 1)
+    ]
+
+
+@pytest.mark.usefixtures("app")
+async def test_player_set_menu_cache() -> None:
+    from nonebot_plugin_alconna import Keyboard
+
+    from nonebot_plugin_werewolf.models import KillReason, Role, RoleGroup
+    from nonebot_plugin_werewolf.utils import add_players_button
+
+    game = fake_game(Role.WEREWOLF, Role.WITCH, Role.GUARD, Role.CIVILIAN)
+    roster = game.players
+    wolf, witch, *_ = roster.sorted
+
+    alive = roster.alive()
+    assert alive.exclude(witch) is roster.alive().exclude(witch)
+    assert alive.select(RoleGroup.WEREWOLF) is alive.select(RoleGroup.WEREWOLF)
+    assert alive.exclude(witch) is not alive.exclude(wolf)
+
+    msg1 = add_players_button("1", roster.alive())
+    msg2 = add_players_button("2", roster.alive())
+    assert msg1[Keyboard][0].children[0] is msg2[Keyboard][0].children[0]
+
+    # 名单变化后生成新的菜单
+    await wolf.kill(KillReason.VOTE)
+    assert roster.alive() is not alive
+    assert wolf not in roster.alive().exclude(witch)
+    assert roster.alive().buttons != alive.buttons
+    assert roster.alive().show() == "1. 1\n2. 2\n3. 3"
+
+
+@pytest.mark.usefixtures("app")
+def test_player_slots() -> None:
+    from nonebot_plugin_werewolf.models import GameContext, KillInfo, KillReason, Role
+
+    game = fake_game(*Role)
+    for player in game.players:
+        assert not hasattr(player, "__dict__")
+        assert player._killed is None  # noqa: SLF001
+        assert player._handler is None  # noqa: SLF001
+
+    witch = game.players.select(Role.WITCH)[0]
+    assert witch.antidote  # pyright: ignore[reportAttributeAccessIssue]
+    assert witch.poison  # pyright: ignore[reportAttributeAccessIssue]
+    idiot = game.players.select(Role.IDIOT)[0]
+    assert not idiot.voted  # pyright: ignore[reportAttributeAccessIssue]
+
+    assert not witch.is_killed
+    witch.killed.set()
+    assert witch.is_killed
+
+    assert not hasattr(GameContext(0), "__dict__")
+    assert not hasattr(KillInfo(KillReason.VOTE, []), "__dict__")
@@ -0,0 +1,56 @@
+# ruff: noqa: S101
+
+import pytest
+
+
+@pytest.mark.usefixtures("app")
+def test_token_bucket() -> None:
+    from nonebot_plugin_werewolf.rate_limit import TokenBucket
+
+    bucket = TokenBucket(rate=2, burst=2)
+    assert bucket.consume(0) == 0
+    assert bucket.consume(0) == 0
+    assert bucket.consume(0) == pytest.approx(0.5)
+    assert bucket.consume(0.5) == 0
+    assert bucket.consume(10) == 0
+    assert bucket.consume(10) == 0
+    assert bucket.consume(10) > 0
+
+
+@pytest.mark.usefixtures("app")
+async def test_rate_limiter_unlimited() -> None:
+    from nonebot_plugin_werewolf.config import TokenBucketConfig
+    from nonebot_plugin_werewolf.rate_limit import RateLimiter
+
+    limiter = RateLimiter(TokenBucketConfig(rate=0))
+    for _ in range(100):
+        await limiter.acquire()
+    assert limiter.waiting == 0
+
+
+@pytest.mark.usefixtures("app")
+async def test_rate_limiter_priority() -> None:
+    import anyio
+    import anyio.lowlevel
+
+    from nonebot_plugin_werewolf.config import TokenBucketConfig
+    from nonebot_plugin_werewolf.rate_limit import Priority, RateLimiter
+
+    limiter = RateLimiter(TokenBucketConfig(rate=50, burst=1))
+    await limiter.acquire()
+
+    order: list[str] = []
+
+    async def acquire(name: str, priority: Priority) -> None:
+        await limiter.acquire(priority)
+        order.append(name)
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(acquire, "broadcast", Priority.BROADCAST)
+        await anyio.lowlevel.checkpoint()
+        tg.start_soon(acquire, "normal", Priority.NORMAL)
+        await anyio.lowlevel.checkpoint()
+        tg.start_soon(acquire, "prompt", Priority.PROMPT)
+
+    assert order == ["prompt", "normal", "broadcast"]
+    assert limiter.waiting == 0
@@ -0,0 +1,77 @@
+# ruff: noqa: S101
+
+import pytest
+
+from .fake import fake_game
+
+
+@pytest.mark.usefixtures("app")
+def test_prompt_parse() -> None:
+    from nonebot_plugin_alconna import UniMessage
+
+    from nonebot_plugin_werewolf.constant import STOP_COMMAND
+    from nonebot_plugin_werewolf.models import Role
+    from nonebot_plugin_werewolf.simulation import AbstainAgent, Prompt
+    from nonebot_plugin_werewolf.utils import add_players_button, add_stop_button
+
+    game = fake_game(Role.WEREWOLF, Role.CIVILIAN, Role.CIVILIAN)
+    msg = add_stop_button(add_players_button("选择", game.players.members), "结束")
+    prompt = Prompt.parse(msg)
+    assert prompt.options == [("0", "1"), ("1", "2"), ("2", "3")]
+    assert prompt.can_stop
+    assert AbstainAgent(game.players.sorted[0]).respond(prompt) == [STOP_COMMAND]
+
+    prompt = Prompt.parse(UniMessage.at("1").text("发言"), group=True)
+    assert prompt.mentions == {"1"}
+    assert not prompt.expects_reply
+
+
+@pytest.mark.usefixtures("app")
+@pytest.mark.parametrize("name", ["heuristic", "random", "spammy"])
+async def test_simulate_game(name: str) -> None:
+    import random
+
+    import anyio
+
+    from nonebot_plugin_werewolf.clock import VirtualClock
+    from nonebot_plugin_werewolf.simulation import Prompt, agents, simulate_game
+
+    clock = VirtualClock()
+    rng = random.Random(7685)  # noqa: S311
+    prompts: list[Prompt] = []
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(clock.run)
+        game = await simulate_game(
+            lambda p: agents[name](p, rng),
+            9,
+            group_id=f"sim-{name}",
+            clock=clock,
+            on_prompt=prompts.append,
+        )
+        tg.cancel_scope.cancel()
+
+    assert game.finished.is_set()
+    assert game.status is not None or game.context.day > 20
+    assert all(p.expects_reply for p in prompts)
+    assert any(p.group for p in prompts)
+
+
+@pytest.mark.usefixtures("app")
+async def test_simulate_game_abstain() -> None:
+    import anyio
+
+    from nonebot_plugin_werewolf.clock import VirtualClock
+    from nonebot_plugin_werewolf.simulation import AbstainAgent, simulate_game
+
+    clock = VirtualClock()
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(clock.run)
+        game = await simulate_game(
+            AbstainAgent, 6, group_id="sim-abstain", clock=clock, max_days=2
+        )
+        tg.cancel_scope.cancel()
+
+    # 无人行动时游戏不会结束, 超过天数上限后中止
+    assert game.status is None
+    assert game.context.day == 3
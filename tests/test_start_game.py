@@ -52,7 +52,7 @@ async def test_start_game_exists(app: App) -> None:
         fake_game = cast("Game", lambda: ...)
         fake_game.group = target
         fake_game.players = PlayerSet()
-        game_registry._games[target] = fake_game  # noqa: SLF001
+        game_registry._add(fake_game)  # noqa: SLF001
         new_event = fake_v11_group_message_event(
             message=Message("werewolf"), to_me=True, group_id=event.group_id
         )
@@ -64,7 +64,7 @@ async def test_start_game_exists(app: App) -> None:
             + "⚠️当前群组内有正在进行的游戏\n无法开始新游戏",
         )
         ctx.should_finished()
-    del game_registry._games[target]  # noqa: SLF001
+    game_registry._remove(fake_game)  # noqa: SLF001
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,66 @@
+# ruff: noqa: S101
+
+import pytest
+
+
+@pytest.mark.usefixtures("app")
+async def test_memory_transport_game() -> None:
+    import anyio
+    from nonebot_plugin_alconna import Keyboard, Target
+
+    from nonebot_plugin_werewolf.game import Game
+    from nonebot_plugin_werewolf.transport import MemoryTransport
+
+    user_ids = {str(i) for i in range(6)}
+    group = Target("20001", self_id="memory")
+
+    async with anyio.create_task_group() as tg:
+        transport = MemoryTransport(
+            {"0": "Alice"}, scene_name="模拟群聊", task_group=tg
+        )
+        game = await Game.new(group, user_ids, transport)
+        await anyio.wait_all_tasks_blocked()
+
+    assert "模拟群聊" in game.log.prefix
+    assert {p.user_id for p in game.players} == user_ids
+    assert {p.name for p in game.players} == {"Alice", *user_ids - {"0"}}
+
+    # 发送的消息记录在内存中, 结束按钮与群聊消息一同发送
+    player = game.players.sorted[0]
+    await player.send("hello", stop_btn_label="结束")
+    await game.messenger.flush()
+    await game.messenger.send("world", stop_btn_label="结束")
+    assert transport.sent is not None
+    [(target, msg), (group_target, group_msg)] = transport.sent
+    assert target is player.user
+    assert msg.extract_plain_text() == "hello"
+    assert msg.has(Keyboard)
+    assert group_target is group
+    assert group_msg.extract_plain_text() == "world"
+
+    transport.put(player.user_id, "1")
+    assert (await player.receive_text()) == "1"
+
+
+@pytest.mark.usefixtures("app")
+async def test_memory_transport_on_send() -> None:
+    from nonebot_plugin_alconna import Target, UniMessage
+
+    from nonebot_plugin_werewolf.transport import MemoryTransport
+
+    transport = MemoryTransport(record=False)
+    received: list[tuple[str, str]] = []
+
+    async def on_send(target: Target, message: UniMessage) -> None:
+        received.append((target.id, message.extract_plain_text()))
+        transport.put(target.id, "ack")
+
+    transport.on_send = on_send
+    await transport.sender(Target("1", private=True)).send_direct("ping")
+
+    assert transport.sent is None
+    assert received == [("1", "ping")]
+    assert (await transport.receive("1")).extract_plain_text() == "ack"
+
+    with pytest.raises(RuntimeError, match="任务组"):
+        transport.start_soon(transport.receive, "1")
@@ -1,7 +1,14 @@
 # ruff: noqa: S101
 
+from typing import TYPE_CHECKING, cast
+
 import pytest
 
+if TYPE_CHECKING:
+    from anyio.abc import TaskGroup
+    from nonebot.adapters import Bot
+    from nonebot_plugin_alconna.uniseg import Receipt
+
 
 @pytest.mark.usefixtures("app")
 def test_check_index() -> None:
@@ -14,3 +21,270 @@ def test_check_index() -> None:
     assert check_index("abc", 5) is None
     assert check_index("", 5) is None
     assert check_index(" ", 5) is None
+
+
+@pytest.mark.usefixtures("app")
+def test_member_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    import time
+
+    from nonebot_plugin_werewolf.utils import MemberCache
+
+    now = 0.0
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache = MemberCache(maxsize=2, ttl=10)
+
+    cache.set("bot", "10001", "1", "a", "avatar")
+    cache.set("bot", "10001", "2", "b")
+    assert cache.get("bot", "10001", "1") == ("a", "avatar")
+    assert cache.get("other", "10001", "1") is None
+
+    # 新条目挤出最久未使用的条目
+    cache.set("bot", "10001", "3", "c")
+    assert cache.get("bot", "10001", "2") is None
+    assert len(cache) == 2
+
+    # 缺少头像时保留已缓存的头像
+    cache.set("bot", "10001", "1", "a2")
+    assert cache.get("bot", "10001", "1") == ("a2", "avatar")
+
+    now = 11.0
+    assert cache.get("bot", "10001", "1") is None
+    assert len(cache) == 1
+
+    disabled = MemberCache(maxsize=2, ttl=0)
+    disabled.set("bot", "10001", "1", "a")
+    assert disabled.get("bot", "10001", "1") is None
+
+
+@pytest.mark.usefixtures("app")
+async def test_scene_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    import time
+
+    from nonebot_plugin_uninfo import Interface, Scene, SceneType
+
+    from nonebot_plugin_werewolf.utils import SceneCache
+
+    class FakeInterface:
+        bot = type("FakeBot", (), {"self_id": "bot"})()
+
+        def __init__(self) -> None:
+            self.calls: list[SceneType] = []
+
+        async def get_scene(self, scene_type: SceneType, scene_id: str) -> Scene | None:
+            self.calls.append(scene_type)
+            if scene_type == SceneType.GUILD:
+                return Scene(scene_id, SceneType.GUILD, name="guild")
+            return None
+
+    now = 0.0
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache = SceneCache(maxsize=2, ttl=10)
+    fake = FakeInterface()
+    interface = cast("Interface", fake)
+
+    assert cache.get("bot", "10001") is None
+    assert await cache.fetch(interface, "10001") == ("guild", None)
+    assert fake.calls == [SceneType.GROUP, SceneType.GUILD]
+    assert cache.get("bot", "10001") == ("guild", None)
+
+    await cache.fetch(interface, "10001")
+    assert len(fake.calls) == 2
+
+    # 缓存过期后直接查询上次成功的场景类型
+    now = 11.0
+    assert cache.get("bot", "10001") is None
+    assert await cache.fetch(interface, "10001") == ("guild", None)
+    assert fake.calls[2:] == [SceneType.GUILD]
+
+    # 缓存与场景类型记录均受条目数限制
+    for group_id in ("10002", "10003"):
+        await cache.fetch(interface, group_id)
+    assert len(cache) == 2
+    assert cache.get("bot", "10001") is None
+    assert len(cache._types) == 2  # noqa: SLF001
+
+
+@pytest.mark.usefixtures("app")
+async def test_input_store_buffer() -> None:
+    from nonebot_plugin_alconna import UniMessage
+
+    from nonebot_plugin_werewolf.utils import InputStore
+
+    store = InputStore()
+    store.put(UniMessage.text("1"), "user")
+    store.put(UniMessage.text("2"), "user")
+    assert store.gauges()["buffered"] == 2
+    assert (await store.fetch("user")).extract_plain_text() == "1"
+    assert (await store.fetch("user")).extract_plain_text() == "2"
+    assert store.gauges() == {"locks": 0, "tasks": 0, "buffers": 0, "buffered": 0}
+
+
+@pytest.mark.usefixtures("app")
+async def test_input_store_buffer_overflow(monkeypatch: pytest.MonkeyPatch) -> None:
+    from nonebot_plugin_alconna import UniMessage
+
+    from nonebot_plugin_werewolf.utils import InputStore
+
+    store = InputStore()
+    monkeypatch.setattr(store, "buffer_size", 2)
+    for text in "123":
+        store.put(UniMessage.text(text), "user")
+    assert store.dropped["oldest"] == 1
+    assert (await store.fetch("user")).extract_plain_text() == "2"
+    assert (await store.fetch("user")).extract_plain_text() == "3"
+
+    monkeypatch.setattr(store, "overflow", "drop_newest")
+    for text in "456":
+        store.put(UniMessage.text(text), "user")
+    assert store.dropped["newest"] == 1
+    assert (await store.fetch("user")).extract_plain_text() == "4"
+    assert (await store.fetch("user")).extract_plain_text() == "5"
+
+
+@pytest.mark.usefixtures("app")
+async def test_input_store_buffer_expired(monkeypatch: pytest.MonkeyPatch) -> None:
+    import anyio
+    from nonebot_plugin_alconna import UniMessage
+
+    from nonebot_plugin_werewolf.utils import InputStore
+
+    store = InputStore()
+    monkeypatch.setattr(store, "buffer_ttl", -1)
+    store.put(UniMessage.text("stale"), "user")
+
+    with anyio.move_on_after(0.1) as scope:
+        await store.fetch("user")
+    assert scope.cancelled_caught
+    assert store.dropped["expired"] == 1
+    assert store.gauges()["locks"] == 0
+
+
+@pytest.mark.usefixtures("app")
+async def test_input_store_close() -> None:
+    from nonebot_plugin_alconna import UniMessage
+
+    from nonebot_plugin_werewolf.utils import InputStore
+
+    store = InputStore()
+    store.put(UniMessage.text("1"), "user")
+    store.close()
+    store.put(UniMessage.text("2"), "user")
+    assert store.gauges()["buffered"] == 0
+
+
+@pytest.mark.usefixtures("app")
+async def test_input_store_chatter_before_turn() -> None:
+    import anyio
+    from nonebot_plugin_alconna import UniMessage
+
+    from nonebot_plugin_werewolf.constant import STOP_COMMAND
+    from nonebot_plugin_werewolf.utils import InputStore
+
+    store = InputStore()
+    # 他人发言期间在群聊中发送的消息不作为自己回合的输入
+    store.put(UniMessage.text(STOP_COMMAND), "user", "group")
+    assert store.gauges()["buffered"] == 0
+
+    with anyio.move_on_after(0.1) as scope:
+        await store.fetch_until_stop("user", "group")
+    assert scope.cancelled_caught
+
+    # 开始新的交互前积压的私聊消息被丢弃
+    store.put(UniMessage.text("1"), "user")
+    store.discard("user")
+    assert store.dropped["stale"] == 1
+    with anyio.move_on_after(0.1) as scope:
+        await store.fetch("user")
+    assert scope.cancelled_caught
+
+
+@pytest.mark.usefixtures("app")
+async def test_send_handler_edit_policy(monkeypatch: pytest.MonkeyPatch) -> None:
+    import anyio
+    from nonebot_plugin_alconna import Target, UniMessage
+    from nonebot_plugin_alconna.uniseg import Keyboard
+
+    from nonebot_plugin_werewolf.clock import VirtualClock
+    from nonebot_plugin_werewolf.config import config
+    from nonebot_plugin_werewolf.utils import SendHandler, btn
+
+    class FakeReceipt:
+        editable = True
+        edited: list[UniMessage]
+
+        def __init__(self) -> None:
+            self.edited = []
+
+        async def edit(self, msg: UniMessage) -> None:
+            self.edited.append(msg)
+
+    class Handler(SendHandler[[]]):
+        def solve_msg(self, msg: UniMessage) -> UniMessage:
+            return msg
+
+    monkeypatch.setattr(config, "enable_button", True)
+    bot = cast("Bot", type("FakeBot", (), {"self_id": "bot"})())
+    handler = Handler(Target("10001", private=True), bot)
+
+    assert handler._take_last() is None  # noqa: SLF001
+
+    receipt = FakeReceipt()
+    handler.last_msg = UniMessage.text("plain")
+    handler.last_receipt = cast("Receipt", receipt)
+    await handler._edit(handler._take_last())  # noqa: SLF001
+    assert receipt.edited == []
+    assert handler.edit_stats["skipped"] == 1
+
+    handler.last_msg = UniMessage.text("prompt").keyboard(btn("1", "1"))
+    handler.last_receipt = cast("Receipt", receipt)
+    last = handler._take_last()  # noqa: SLF001
+    assert handler._take_last() is None  # noqa: SLF001
+    await handler._edit(last)  # noqa: SLF001
+    assert len(receipt.edited) == 1
+    assert not receipt.edited[0].has(Keyboard)
+    assert handler.edit_stats["performed"] == 1
+
+    # 延迟修改: 连续发送时每条带按钮的消息仍会被修改, 修改失败不影响后续任务
+    class FailingReceipt(FakeReceipt):
+        async def edit(self, msg: UniMessage) -> None:
+            raise RuntimeError(msg.extract_plain_text())
+
+    class DelayedHandler(Handler):
+        def __init__(self, task_group: "TaskGroup") -> None:
+            super().__init__(Target("10001", private=True), bot)
+            self.clock = VirtualClock()
+            self.task_group = task_group
+            self.receipts: list[FakeReceipt] = []
+
+        def _background(self) -> "TaskGroup":
+            return self.task_group
+
+        async def _send(
+            self, message: UniMessage, *_: object, **__: object
+        ) -> "Receipt":
+            fail = message.extract_plain_text() == "fail"
+            receipt = FailingReceipt() if fail else FakeReceipt()
+            self.receipts.append(receipt)
+            self.last_msg, self.last_receipt = message, cast("Receipt", receipt)
+            return self.last_receipt
+
+    monkeypatch.setattr(config, "edit_delay", 1.0)
+    async with anyio.create_task_group() as tg:
+        delayed = DelayedHandler(tg)
+        for text in ("1", "fail", "3"):
+            await delayed.send(UniMessage.text(text).keyboard(btn(text, text)))
+        await anyio.wait_all_tasks_blocked()
+        assert delayed.receipts[0].edited == []
+
+        delayed.clock.advance(1.0)
+        await anyio.wait_all_tasks_blocked()
+        assert not delayed.receipts[0].edited[0].has(Keyboard)
+        assert delayed.edit_stats == {"performed": 1, "failed": 1}
+
+        # 游戏结束时未完成的延迟修改立即执行
+        await delayed.send("4")
+        await anyio.wait_all_tasks_blocked()
+        tg.cancel_scope.cancel()
+
+    assert len(delayed.receipts[2].edited) == 1
+    assert delayed.edit_stats == {"performed": 2, "failed": 1}
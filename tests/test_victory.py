@@ -0,0 +1,65 @@
+# ruff: noqa: S101
+
+import pytest
+
+from .fake import fake_game
+
+
+@pytest.mark.usefixtures("app")
+def test_check_victory() -> None:
+    from nonebot_plugin_werewolf.models import AliveCounter, GameStatus
+    from nonebot_plugin_werewolf.victory import check_victory
+
+    assert check_victory(AliveCounter(werewolf=2, civilian=2, god=2)) is None
+    assert check_victory(AliveCounter(werewolf=1, civilian=1, others=1)) is (
+        GameStatus.WEREWOLF
+    )
+    assert check_victory(AliveCounter(werewolf=2, civilian=3, god=2)) is None
+    assert check_victory(AliveCounter(werewolf=1, god=3)) is GameStatus.WEREWOLF
+    assert check_victory(AliveCounter(werewolf=1, civilian=3)) is GameStatus.WEREWOLF
+    assert check_victory(AliveCounter(civilian=1, god=1)) is GameStatus.GOODGUY
+
+
+@pytest.mark.usefixtures("app")
+def test_custom_victory_rule(monkeypatch: pytest.MonkeyPatch) -> None:
+    from nonebot_plugin_werewolf import victory
+    from nonebot_plugin_werewolf.models import AliveCounter, GameStatus
+
+    monkeypatch.setattr(victory, "victory_rules", victory.victory_rules.copy())
+
+    @victory.victory_rule
+    def _jester_alone(c: AliveCounter) -> GameStatus | None:
+        return GameStatus.JESTER if c.others and not c.non_werewolf - c.others else None
+
+    # 内置条件优先检查
+    assert victory.check_victory(AliveCounter(werewolf=1, others=1)) is (
+        GameStatus.WEREWOLF
+    )
+    victory.victory_rules.insert(0, victory.victory_rules.pop())
+    assert victory.check_victory(AliveCounter(werewolf=1, others=1)) is (
+        GameStatus.JESTER
+    )
+
+
+@pytest.mark.usefixtures("app")
+async def test_roster_counter() -> None:
+    from nonebot_plugin_werewolf.exception import GameFinished
+    from nonebot_plugin_werewolf.models import (
+        AliveCounter,
+        GameStatus,
+        KillReason,
+        Role,
+    )
+
+    game = fake_game(Role.WEREWOLF, Role.WITCH, Role.JESTER, Role.CIVILIAN)
+    witch = game.players.sorted[1]
+    assert game.players.counter == AliveCounter(1, 1, 1, 1)
+    game.raise_for_status()
+
+    await witch.kill(KillReason.VOTE)
+    await witch.kill(KillReason.VOTE)
+    assert game.players.counter == AliveCounter(1, 1, 0, 1)
+
+    with pytest.raises(GameFinished) as exc_info:
+        game.raise_for_status()
+    assert exc_info.value.status is GameStatus.WEREWOLF
@@ -0,0 +1,108 @@
+# ruff: noqa: S101
+
+import pytest
+
+from .fake import fake_game
+
+
+@pytest.mark.usefixtures("app")
+async def test_werewolf_team_chat(monkeypatch: pytest.MonkeyPatch) -> None:
+    import anyio
+    import anyio.lowlevel
+    from nonebot_plugin_alconna import UniMessage
+
+    from nonebot_plugin_werewolf.models import Role
+    from nonebot_plugin_werewolf.player import Player
+    from nonebot_plugin_werewolf.players.werewolf import WerewolfTeamChat
+
+    sent: list[tuple[str, str]] = []
+
+    async def send(self: Player, message: str | UniMessage, **_: object) -> None:
+        text = message if isinstance(message, str) else message.extract_plain_text()
+        await anyio.lowlevel.checkpoint()
+        if self.user_id == "4" and text == "d":
+            raise RuntimeError("send failed")
+        sent.append((self.user_id, text))
+
+    monkeypatch.setattr(Player, "send", send)
+
+    game = fake_game(
+        Role.WEREWOLF, Role.WEREWOLF, Role.WOLFKING, Role.CIVILIAN, Role.WEREWOLF
+    )
+    w0, w1, w2, civilian, w3 = game.players.sorted
+    chat = WerewolfTeamChat(game.players.alive().select(Role.WEREWOLF, Role.WOLFKING))
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(chat.run)
+        chat.post(w0, "a")
+        chat.post(w1, "b")
+        # 发送消息不等待转发完成
+        assert sent == []
+        await anyio.wait_all_tasks_blocked()
+        sent.clear()
+
+        # 转发给某个队友失败时仍转发给其余队友, 频道继续运行
+        chat.post(w0, "d")
+        chat.post(w3, "e")
+        await chat.close(game.clock)
+
+    # 每条消息只转发一次, 且不回发给发送者
+    assert sorted(sent) == [
+        ("0", "e"),
+        ("1", "d"),
+        ("1", "e"),
+        ("2", "d"),
+        ("2", "e"),
+    ]
+    assert chat.failed == {"4": 1}
+
+    # 频道关闭后的消息不再转发
+    chat.post(w0, "c")
+    assert len(sent) == 5
+
+    chat.select(w0, civilian)
+    chat.select(w1, civilian)
+    assert chat.targets() == {civilian}
+    chat.select(w2, w0)
+    assert chat.targets() == {civilian, w0}
+
+
+@pytest.mark.usefixtures("app")
+async def test_werewolf_finalize(monkeypatch: pytest.MonkeyPatch) -> None:
+    import anyio
+    from nonebot_plugin_alconna import UniMessage
+
+    from nonebot_plugin_werewolf.models import Role
+    from nonebot_plugin_werewolf.player import Player
+    from nonebot_plugin_werewolf.transport import MemoryTransport
+
+    async def send(self: Player, message: str | UniMessage, **_: object) -> None:
+        pass
+
+    monkeypatch.setattr(Player, "send", send)
+
+    async with anyio.create_task_group() as tg:
+        # 女巫存活时狼人回合结束后不会额外等待
+        game = fake_game(
+            Role.WEREWOLF,
+            Role.WEREWOLF,
+            Role.WITCH,
+            Role.CIVILIAN,
+            transport=MemoryTransport(task_group=tg),
+        )
+        w0, w1, _, civilian = game.players.sorted
+        for wolf in (w0, w1):
+            await wolf.interact_provider(wolf).before()
+
+        chat = game.context.werewolf_chat
+        assert chat is not None
+        assert chat.members == {w0, w1}
+        chat.select(w0, civilian)
+        chat.select(w1, civilian)
+
+        for wolf in (w0, w1):
+            await wolf.interact_provider(wolf).after()
+        assert game.context.killed is civilian
+
+    game.context.reset()
+    assert game.context.werewolf_chat is None